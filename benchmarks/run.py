@@ -0,0 +1,192 @@
+"""Benchmarks SeleniumUtils and FormHandler against local copies of the test forms.
+
+    python -m benchmarks.run --output reports/benchmarks/latest.json
+    python -m benchmarks.run --baseline reports/benchmarks/baseline.json --max-regression 0.2
+
+Exits with status 1 when an operation's median latency regressed by more than
+--max-regression compared to the baseline file.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+import statistics
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from selenium.webdriver.common.by import By
+from config.driver_setup import create_driver
+from utils.csv_utils import CSVUtils
+from utils.form_handler import FormHandler
+from utils.form_registry import registry
+from utils.helpers import SeleniumUtils
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'site')
+PROFILE_FORM = os.path.join(ROOT, 'form_definitions', 'profilepage_form.csv')
+PROFILE_DATA = os.path.join(ROOT, 'form_data', 'profile_page_data.csv')
+LOGIN_FORM = os.path.join(ROOT, 'form_definitions', 'login_form.csv')
+LOGIN_DATA = os.path.join(ROOT, 'form_data', 'login_data.csv')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_site():
+    """Serve the fixture site from an in-process HTTP server; returns (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=SITE_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands sent by a driver."""
+
+    def __init__(self, driver):
+        self.count = 0
+        executor = driver.command_executor
+        original = executor.execute
+
+        def execute(command, params):
+            self.count += 1
+            return original(command, params)
+
+        executor.execute = execute
+
+
+class Recorder:
+    """Collects latency samples and round-trip counts per operation."""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.samples = {}
+        self.round_trips = {}
+
+    def measure(self, name, func, *args):
+        trips = self.counter.count
+        start = time.perf_counter()
+        result = func(*args)
+        self.samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        self.round_trips.setdefault(name, []).append(self.counter.count - trips)
+        return result
+
+    def summary(self):
+        results = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            results[name] = {
+                'count': len(ordered),
+                'mean_ms': round(statistics.fmean(ordered), 3),
+                'p50_ms': round(percentile(ordered, 50), 3),
+                'p90_ms': round(percentile(ordered, 90), 3),
+                'p99_ms': round(percentile(ordered, 99), 3),
+                'round_trips': round(statistics.fmean(self.round_trips[name]), 2),
+            }
+        return results
+
+
+def percentile(ordered, pct):
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run(iterations, profile):
+    server, base_url = serve_site()
+    driver = create_driver(profile)
+    try:
+        recorder = Recorder(RoundTripCounter(driver))
+        utils = SeleniumUtils(driver)
+        handler = FormHandler(driver)
+        login_rows = CSVUtils.read_csv(LOGIN_DATA)
+        profile_rows = CSVUtils.read_csv(PROFILE_DATA)
+        definition = registry.get(PROFILE_FORM)
+        rows_per_second = {}
+
+        for _ in range(iterations):
+            recorder.measure('page_load', utils.open_url, f"{base_url}/login.html")
+            recorder.measure('find_element', utils.find_element, (By.NAME, 'username'))
+            recorder.measure('enter_text', utils.enter_text, (By.NAME, 'username'), 'Admin')
+            recorder.measure('get_text', utils.get_text, (By.ID, 'result'))
+            for row in login_rows:
+                recorder.measure('fill_form[login]', handler.fill_form, LOGIN_FORM, row)
+
+        for mode, batched in (('sequential', False), ('batched', True)):
+            start = time.perf_counter()
+            rows = 0
+            for _ in range(iterations):
+                for row in profile_rows:
+                    utils.open_url(f"{base_url}/profile.html")
+                    recorder.measure(f'fill_form[profile,{mode}]', handler.fill_form, PROFILE_FORM, row, batched)
+                    rows += 1
+            rows_per_second[mode] = round(rows / (time.perf_counter() - start), 3)
+
+        # Per field type, through the same dispatch FormHandler.fill_form uses
+        utils.open_url(f"{base_url}/profile.html")
+        for _ in range(iterations):
+            for row in profile_rows:
+                for field in definition.fields:
+                    value = row.get(field.name, "").strip()
+                    if value and field.action:
+                        recorder.measure(f'field[{field.field_type}]', handler._actions[field.action],
+                                         handler.get_locators(field), value)
+
+        return {'results': recorder.summary(), 'rows_per_second': rows_per_second}
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+def compare(current, baseline, max_regression):
+    """Return a list of operations whose median latency regressed beyond max_regression."""
+    regressions = []
+    for name, result in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous and previous['p50_ms'] > 0:
+            change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms']
+            if change > max_regression:
+                regressions.append(f"{name}: p50 {previous['p50_ms']}ms -> {result['p50_ms']}ms (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--profile', default='headless', help='driver profile from config/config.yaml')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'reports', 'benchmarks', 'latest.json'))
+    parser.add_argument('--baseline', help='earlier result file to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    result = run(args.iterations, args.profile)
+    result['meta'] = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                      'platform': platform.platform(), 'iterations': args.iterations,
+                      'profile': args.profile}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(result, file, indent=2)
+
+    print(f"{'operation':<32}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'trips':>8}")
+    for name, stats in sorted(result['results'].items()):
+        print(f"{name:<32}{stats['p50_ms']:>10}{stats['p90_ms']:>10}{stats['p99_ms']:>10}{stats['round_trips']:>8}")
+    for mode, rate in result['rows_per_second'].items():
+        print(f"rows/s ({mode}): {rate}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(result, json.load(file), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import os
+import atexit
+import logging
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
+import yaml
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from utils.instrumentation import instrument_driver
+from utils.network import block_urls, enable_asset_cache, get_proxy
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = os.environ.get('CONFIG_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml'))
+
+_user_data_dirs = []
+_service = None
+_browser_path = None
+_service_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str = CONFIG_FILE):
+    """Load and cache the YAML configuration."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.safe_load(file) or {}
+
+
+def get_driver_settings():
+    """Return the `driver` section of config.yaml."""
+    return dict(load_config().get('driver') or {})
+
+
+def get_profile(name: str = None):
+    """Return the named driver profile, defaulting to DRIVER_PROFILE or driver.profile in config.yaml."""
+    config = load_config()
+    profiles = config.get('profiles', {})
+    name = name or os.environ.get('DRIVER_PROFILE') or config.get('driver', {}).get('profile', 'headless')
+    if name not in profiles:
+        raise ValueError(f"Unknown driver profile '{name}'. Available: {', '.join(sorted(profiles))}")
+    return dict(profiles[name])
+
+
+def build_options(profile: dict):
+    """Translate a profile into ChromeOptions."""
+    if profile.get('browser', 'chrome') != 'chrome':
+        raise ValueError(f"Unsupported browser '{profile['browser']}'")
+    options = webdriver.ChromeOptions()
+    if profile.get('headless'):
+        options.add_argument('--headless=new')
+    width, height = profile.get('window_size') or (1920, 1080)
+    options.add_argument(f'--window-size={width},{height}')
+    options.page_load_strategy = profile.get('page_load_strategy', 'normal')
+    if profile.get('disable_extensions', True):
+        options.add_argument('--disable-extensions')
+    prefs = {}
+    if profile.get('disable_images'):
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        prefs['profile.managed_default_content_settings.images'] = 2
+    if profile.get('download_dir'):
+        prefs['download.default_directory'] = os.path.abspath(profile['download_dir'])
+        prefs['download.prompt_for_download'] = False
+    if prefs:
+        options.add_experimental_option('prefs', prefs)
+    for argument in profile.get('arguments') or ():
+        options.add_argument(argument)
+    if profile.get('network_proxy'):
+        proxy = get_proxy(profile.get('blocked_urls') or ())
+        options.add_argument(f'--proxy-server={proxy.url}')
+    template = profile.get('user_data_dir_template')
+    if template:
+        options.add_argument(f'--user-data-dir={_copy_user_data_dir(template)}')
+    return options
+
+
+def _copy_user_data_dir(template):
+    # Each browser needs its own user-data-dir; start it from a prepared template
+    target = tempfile.mkdtemp(prefix='chrome-profile-')
+    shutil.copytree(template, target, dirs_exist_ok=True)
+    _user_data_dirs.append(target)
+    return target
+
+
+@atexit.register
+def _remove_user_data_dirs():
+    for path in _user_data_dirs:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def apply_runtime_settings(driver, profile: dict):
+    """Apply settings that need a running browser, such as URL blocking and the asset cache."""
+    blocked = profile.get('blocked_urls')
+    if blocked:
+        try:
+            block_urls(driver, blocked)
+        except WebDriverException:
+            pass
+    if profile.get('network_cache'):
+        try:
+            enable_asset_cache(driver, profile.get('network_cache_mb', 256))
+        except (RuntimeError, OSError):
+            logger.warning("Asset cache is not available for this browser", exc_info=True)
+
+
+class SharedService(Service):
+    """The chromedriver shared by every browser of this process.
+
+    start() launches it only once and stop() leaves it running, so webdriver.Chrome can be
+    given this service and quitting a browser only ends its session.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            process = getattr(self, 'process', None)
+            if process is None or process.poll() is not None:
+                super().start()
+
+    def stop(self):
+        pass  # Stopped by stop_service() when the process exits
+
+    def shutdown(self):
+        """Stop the chromedriver process."""
+        super().stop()
+
+
+def get_service():
+    """Return this process's shared chromedriver service; webdriver.Chrome starts it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SharedService()
+        return _service
+
+
+@atexit.register
+def stop_service():
+    """Stop the shared chromedriver."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
+            _service = None
+
+
+def _shared_service_chrome(options):
+    global _browser_path
+    # Once the service has a driver path Selenium Manager is skipped, and with it the browser
+    # path it found; keep using the browser the first session was started with
+    if _browser_path and not options.binary_location:
+        options.binary_location = _browser_path
+    driver = webdriver.Chrome(service=get_service(), options=options)
+    _browser_path = _browser_path or options.binary_location
+    return driver
+
+
+def create_driver(profile: str = None, **overrides):
+    """Create a browser from a named profile in config.yaml; keyword arguments override profile keys."""
+    settings = get_profile(profile)
+    settings.update(overrides)
+    options = build_options(settings)
+    if get_driver_settings().get('reuse_service', True):
+        driver = _shared_service_chrome(options)
+    else:
+        driver = webdriver.Chrome(options=options)
+    apply_runtime_settings(driver, settings)
+    return instrument_driver(driver)
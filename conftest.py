@@ -1,28 +1,122 @@
+import os
+import re
 import pytest
-from selenium import webdriver
-from utils.helpers import SeleniumUtils
-from selenium.webdriver.common.by import By
+from utils.driver_pool import DriverPool, default_pool_size
+from config.driver_setup import get_driver_settings
+from utils.session_cache import SessionCache
+from utils.locator_engine import locator_engine
+from utils.artifacts import ArtifactPipeline
+from pages.login_page import LoginPage
+
+pytest_plugins = ["utils.pytest_profiler", "utils.pytest_form_validation", "utils.pytest_scheduler",
+                  "utils.pytest_logging", "utils.pytest_report"]
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(__file__), "reports", "artifacts")
+
+driver_pool_key = pytest.StashKey[DriverPool]()
+
+# driver, module_driver and pooled_driver can each hold a browser at the same time
+FIXTURE_LEASES = 3
+# Seconds a fixture waits for a free browser before failing with the pool usage
+LEASE_TIMEOUT = float(os.environ.get("DRIVER_LEASE_TIMEOUT", get_driver_settings().get("lease_timeout", 300)))
+
+
+def is_xdist_controller(config):
+    """True in the pytest-xdist controller process, which distributes tests but runs none."""
+    return getattr(config, "workerinput", None) is None and getattr(config.option, "dist", "no") != "no"
+
+
+def pytest_sessionstart(session):
+    if is_xdist_controller(session.config):
+        return
+    # Browsers start launching in the background while tests are still being collected
+    settings = get_driver_settings()
+    pool = DriverPool(size=max(default_pool_size(), FIXTURE_LEASES),
+                      spares=int(os.environ.get("DRIVER_SPARES", settings.get("spares", 0))))
+    pool.prewarm(int(os.environ.get("DRIVER_PREWARM", settings.get("prewarm", 0))))
+    session.config.stash[driver_pool_key] = pool
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    # Runs after session fixtures are torn down. Quits every browser of the pool, including prewarmed ones no test asked for
+    pool = session.config.stash.get(driver_pool_key, None)
+    if pool is not None:
+        pool.close()
+    # Keep the locator ranking learned in this run for the next one
+    locator_engine.save()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call" or not report.failed:
+        return
+    # Capture evidence from the test's browser; files are written in the background
+    pipeline = item.funcargs.get("artifact_pipeline")
+    driver = next((item.funcargs[name] for name in ("pooled_driver", "module_driver", "driver", "login") if name in item.funcargs), None)
+    if pipeline is None or driver is None:
+        return
+    base = os.path.join(ARTIFACT_DIR, re.sub(r"[^\w.\-]+", "_", item.nodeid).strip("_"))
+    try:
+        report.user_properties.append(("screenshot", pipeline.capture_screenshot(driver, base + ".png")))
+        report.user_properties.append(("page_source", pipeline.capture_page_source(driver, base + ".html")))
+    except Exception:
+        pass  # The browser may be gone; never mask the original failure
+
+
+@pytest.fixture(scope="session", autouse=True)
+def artifact_pipeline():
+    pipeline = ArtifactPipeline()
+    yield pipeline
+    pipeline.close()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    # Closed in pytest_sessionfinish
+    return request.config.stash[driver_pool_key]
 
 
 @pytest.fixture(scope="session")
-def driver():
-    driver = webdriver.Chrome()  # Or any other WebDriver
+def driver(driver_pool):
+    driver = driver_pool.acquire(LEASE_TIMEOUT)
     yield driver
-    driver.quit()
+    driver_pool.release(driver)
+
+
+@pytest.fixture
+def pooled_driver(driver_pool):
+    """A browser leased for a single test and reset afterwards."""
+    with driver_pool.lease(LEASE_TIMEOUT) as driver:
+        yield driver
+
+
+@pytest.fixture(scope="module")
+def module_driver(driver_pool):
+    """A browser kept for all tests of a module, so data rows can reuse the loaded form page."""
+    with driver_pool.lease(LEASE_TIMEOUT) as driver:
+        yield driver
+
+
+@pytest.fixture(scope="session")
+def session_cache():
+    return SessionCache()
 
 
 @pytest.fixture(scope="session")
-def login(driver):
-    utils = SeleniumUtils(driver)
-    utils.maximize_window()
-    utils.open_url("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
-
-    # Replace with actual login steps
-    utils.enter_text((By.NAME, "username"), "Admin")
-    utils.enter_text((By.NAME, "password"), "admin123")
-    utils.click_element((By.CLASS_NAME, "orangehrm-login-button"))
-
-    # Ensure login is successful, e.g., by checking for the presence of a logout button
-    assert utils.is_element_visible((By.CLASS_NAME, "oxd-topbar-header-breadcrumb"))
+def login(driver, session_cache):
+    page = LoginPage(driver)
+
+    def ui_login():
+        # Replace with actual credentials
+        page.open()
+        page.login("Admin", "admin123")
+
+    # Reuse cookies/storage from an earlier login when they are still valid
+    session_cache.ensure_logged_in(driver, "Admin", "https://opensource-demo.orangehrmlive.com",
+                                   ui_login, page.is_logged_in,
+                                   landing_url="https://opensource-demo.orangehrmlive.com/web/index.php/dashboard/index")
 
     yield driver
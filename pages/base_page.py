@@ -0,0 +1,211 @@
+import time
+import functools
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from utils.locator_engine import is_locator_chain, locator_engine
+from utils.scripts import DOCUMENT_STATE_JS
+
+# Element methods that can make the browser load a new document or route
+NAVIGATING_ACTIONS = frozenset({'click', 'submit', 'send_keys'})
+
+
+class Element:
+    """A page element declared on the class, found on first use and cached per page instance.
+
+        class LoginPage(BasePage):
+            username = Element(By.NAME, "username")
+            submit = Element((By.ID, "login"), (By.CSS_SELECTOR, "button[type=submit]"))
+    """
+
+    def __init__(self, *locator, timeout: float = None):
+        # Either (By, value) or a fallback chain of (By, value) tuples
+        self.locators = tuple(tuple(item) for item in locator) if is_locator_chain(locator) else (tuple(locator),)
+        self.timeout = timeout
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner):
+        if page is None:
+            return self
+        return ElementHandle(page, self)
+
+    def find(self, page):
+        """Look the element up in the browser, waiting up to the timeout."""
+        timeout = page.timeout if self.timeout is None else self.timeout
+        return locator_engine.find(page.driver, self.locators, timeout)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class Elements(Element):
+    """All elements matched by the first locator of the chain that matches any, cached like Element.
+
+    A lookup waits up to the timeout for at least one match; an empty result is not cached.
+    """
+
+    def __get__(self, page, owner):
+        if page is None:
+            return self
+        return [ElementHandle(page, self, index) for index in range(len(page.resolve(self)))]
+
+    def find(self, page):
+        timeout = page.timeout if self.timeout is None else self.timeout
+        deadline = time.monotonic() + timeout
+        ordered = locator_engine.order(self.locators)
+        while True:
+            for locator in ordered:
+                try:
+                    elements = page.driver.find_elements(*locator)
+                except WebDriverException:
+                    continue
+                if elements:
+                    return elements
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            time.sleep(min(locator_engine.poll_interval, remaining))
+
+
+class ElementHandle:
+    """Proxy for a cached WebElement that re-finds it once when it has gone stale.
+
+    Attribute and method access are forwarded, e.g. handle.click() or handle.text.
+    Use handle.element where a real WebElement is required (ActionChains).
+    """
+
+    __slots__ = ('_page', '_descriptor', '_index')
+
+    def __init__(self, page, descriptor, index=None):
+        self._page = page
+        self._descriptor = descriptor
+        self._index = index
+
+    @property
+    def element(self):
+        """The cached WebElement."""
+        element = self._page.resolve(self._descriptor)
+        if self._index is None:
+            return element
+        if self._index >= len(element):
+            raise NoSuchElementException(f"{self!r} no longer exists: {self._descriptor.name} matches "
+                                         f"{len(element)} element(s)")
+        return element[self._index]
+
+    def _retry(self, action):
+        try:
+            return action(self.element)
+        except StaleElementReferenceException:
+            self._page.forget(self._descriptor)
+            return action(self.element)
+
+    def __getattr__(self, name):
+        value = self._retry(lambda element: getattr(element, name))
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def call(*args, **kwargs):
+            try:
+                return self._retry(lambda element: getattr(element, name)(*args, **kwargs))
+            finally:
+                if name in NAVIGATING_ACTIONS:
+                    self._page.revalidate()
+        return call
+
+    def __repr__(self):
+        suffix = '' if self._index is None else f"[{self._index}]"
+        return f"<{type(self._page).__name__}.{self._descriptor.name}{suffix}>"
+
+
+def navigates(method):
+    """Mark a page method that loads a new document, so cached elements are dropped afterwards."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.invalidate()
+    return wrapper
+
+
+class BasePage:
+    """Base class for page objects; subclasses declare Element/Elements attributes and an optional url."""
+
+    url = None
+
+    def __init__(self, driver, timeout: float = 10):
+        self.driver = driver
+        self.timeout = timeout
+        self._cache = {}
+        self._document = None
+        self._revalidate = False
+
+    def resolve(self, descriptor):
+        """Return the cached lookup result of descriptor, finding it on first use."""
+        if self._revalidate:
+            self._revalidate = False
+            if self._cache and self._document_state() != self._document:
+                self.invalidate()
+        try:
+            return self._cache[descriptor]
+        except KeyError:
+            found = descriptor.find(self)
+            if found:  # An empty Elements result may just mean the page has not rendered yet
+                if not self._cache:
+                    self._document = self._document_state()
+                self._cache[descriptor] = found
+            return found
+
+    def revalidate(self):
+        """Check on the next lookup whether the URL or document changed, dropping cached elements if so.
+
+        Called after element actions that can navigate, such as click().
+        """
+        self._revalidate = True
+
+    def _document_state(self):
+        try:
+            return self.driver.execute_script(DOCUMENT_STATE_JS)
+        except WebDriverException:
+            return None
+
+    def forget(self, descriptor):
+        """Drop the cached lookup of one descriptor."""
+        self._cache.pop(descriptor, None)
+
+    def invalidate(self):
+        """Drop every cached element, e.g. after navigation."""
+        self._cache.clear()
+
+    def is_present(self, name: str, timeout: float = None):
+        """Return True if the element declared as `name` is found and displayed within timeout."""
+        descriptor = getattr(type(self), name)
+        if timeout is not None:
+            descriptor = Element(*descriptor.locators, timeout=timeout)
+            descriptor.name = name
+        try:
+            return bool(ElementHandle(self, descriptor).is_displayed())
+        except (TimeoutException, StaleElementReferenceException):
+            return False
+        finally:
+            if timeout is not None:
+                self.forget(descriptor)
+
+    @navigates
+    def open(self, url: str = None):
+        """Load the page's url (or the given one)."""
+        self.driver.get(url or self.url)
+        return self
+
+    @navigates
+    def refresh(self):
+        """Reload the current page."""
+        self.driver.refresh()
+
+    @navigates
+    def go_back(self):
+        """Go back to the previous page."""
+        self.driver.back()
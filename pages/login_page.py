@@ -0,0 +1,24 @@
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage, Element, navigates
+
+
+class LoginPage(BasePage):
+    url = "https://opensource-demo.orangehrmlive.com/web/index.php/auth/login"
+
+    username = Element(By.NAME, "username")
+    password = Element(By.NAME, "password")
+    submit = Element(By.CLASS_NAME, "orangehrm-login-button")
+    breadcrumb = Element(By.CLASS_NAME, "oxd-topbar-header-breadcrumb")
+
+    @navigates
+    def login(self, username: str, password: str):
+        """Submit the login form."""
+        self.username.clear()
+        self.username.send_keys(username)
+        self.password.clear()
+        self.password.send_keys(password)
+        self.submit.click()
+
+    def is_logged_in(self, timeout: float = 10):
+        """Return True once the dashboard header is shown."""
+        return self.is_present('breadcrumb', timeout)
@@ -0,0 +1,91 @@
+import time
+import threading
+import pytest
+from utils.actors import Actor, Scenario, expand_users
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_scenario(*names):
+    return Scenario([Actor(name, FakeDriver()) for name in names])
+
+
+def test_steps_run_concurrently_and_sync_at_barrier():
+    scenario = make_scenario('author', 'approver')
+    order = []
+
+    def author(actor):
+        time.sleep(0.2)
+        order.append('submitted')
+        scenario.sync()
+        return actor.name
+
+    def approver(actor):
+        scenario.sync()
+        order.append('approved')
+        return threading.current_thread().name
+
+    start = time.monotonic()
+    results = scenario.run({'author': author, 'approver': approver})
+    assert order == ['submitted', 'approved']
+    assert results['author'] == 'author'
+    assert time.monotonic() - start < 0.4
+    scenario.close()
+    assert all(actor.driver.quit_called for actor in scenario.actors.values())
+
+
+def test_failing_step_releases_waiting_actors_and_reports_root_cause():
+    scenario = make_scenario('a', 'b')
+
+    def broken(actor):
+        raise ValueError('boom')
+
+    with pytest.raises(RuntimeError, match="Actor 'a' failed: ValueError"):
+        scenario.run({'a': broken, 'b': lambda actor: scenario.sync(timeout=5)}, timeout=5)
+    scenario.close()
+
+
+def test_wait_for_sees_change_made_by_other_actor():
+    scenario = make_scenario('sender', 'receiver')
+    inbox = []
+
+    def receiver(actor):
+        return scenario.wait_for('receiver', lambda a: inbox and inbox[0], timeout=2)
+
+    results = scenario.run({'sender': lambda actor: inbox.append('hello'), 'receiver': receiver})
+    assert results['receiver'] == 'hello'
+    with pytest.raises(TimeoutError):
+        scenario['sender'].wait_until(lambda a: False, timeout=0.1)
+    scenario.close()
+
+
+def test_counted_users_expand_into_numbered_actors():
+    users = expand_users({'admin': {'username': 'Admin'},
+                          'reviewer': {'count': 3, 'username': 'reviewer{n}', 'retries': 2}})
+    assert list(users) == ['admin', 'reviewer1', 'reviewer2', 'reviewer3']
+    assert users['reviewer2'] == {'username': 'reviewer2', 'retries': 2}
+
+
+def test_actor_that_never_syncs_releases_the_others():
+    scenario = make_scenario('a', 'b')
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="Actor 'b' failed: BrokenBarrierError"):
+        scenario.run({'a': lambda actor: 'done early', 'b': lambda actor: (time.sleep(0.1), scenario.sync())})
+    scenario.close()
+    assert time.monotonic() - start < 2
+
+
+def test_run_timeout_releases_waiting_actors_so_close_returns():
+    scenario = make_scenario('a', 'b')
+    with pytest.raises(TimeoutError, match="a, b"):
+        scenario.run({'a': lambda actor: scenario.sync(), 'b': lambda actor: (time.sleep(0.5), scenario.sync())},
+                     timeout=0.2)
+    start = time.monotonic()
+    scenario.close()
+    assert time.monotonic() - start < 2
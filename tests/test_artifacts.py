@@ -0,0 +1,41 @@
+import base64
+import gzip
+import os
+from utils.artifacts import ArtifactPipeline
+from utils.helpers import SeleniumUtils
+
+PNG = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==")
+
+
+class FakeDriver:
+    page_source = "<html><body>form</body></html>"
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.frames.pop(0)).decode('ascii')
+
+
+def test_screenshots_are_written_in_background_and_deduplicated(tmp_path):
+    pipeline = ArtifactPipeline(max_pending_bytes=1)
+    utils = SeleniumUtils(FakeDriver([PNG, PNG, PNG + b'changed']), artifacts=pipeline)
+
+    paths = [utils.take_screenshot(str(tmp_path / f"step{step}.png")) for step in range(3)]
+    assert pipeline.close() == 0
+
+    assert paths == [str(tmp_path / 'step0.png'), str(tmp_path / 'step0.png'), str(tmp_path / 'step2.png')]
+    assert all(os.path.exists(path) for path in paths)
+
+    assert sorted(os.listdir(tmp_path)) == ['step0.png', 'step2.png']
+    assert (tmp_path / 'step0.png').read_bytes() == PNG
+
+
+def test_page_source_is_compressed(tmp_path):
+    pipeline = ArtifactPipeline()
+    path = pipeline.capture_page_source(FakeDriver([]), str(tmp_path / 'page.html'))
+    pipeline.flush()
+
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        assert file.read() == FakeDriver.page_source
+    pipeline.close()
@@ -0,0 +1,150 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage, Element, Elements, navigates
+from utils.locator_engine import LocatorEngine
+import pages.base_page
+
+
+class FakeElement:
+    def __init__(self, text, on_click=None):
+        self._text = text
+        self.stale = False
+        self.clicks = 0
+        self.on_click = on_click
+
+    @property
+    def text(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale")
+        return self._text
+
+    def click(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale")
+        self.clicks += 1
+        if self.on_click:
+            self.on_click()
+
+    def is_displayed(self):
+        return True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.lookups = []
+        self.generation = 0
+        self.elements = {}
+        self.url = "about:blank"
+
+    def find_elements(self, by, value):
+        self.lookups.append((by, value))
+        key = (by, value, self.generation)
+        if key not in self.elements:
+            if value == 'missing':
+                return []
+            count = 3 if by == By.CSS_SELECTOR else 1
+            self.elements[key] = [FakeElement(f"{value}-{self.generation}-{i}") for i in range(count)]
+        return self.elements[key]
+
+    def get(self, url):
+        self.generation += 1
+        self.url = url
+
+    def execute_script(self, script):
+        return [self.generation, self.url]
+
+
+class ExamplePage(BasePage):
+    url = "https://example.com"
+    title = Element(By.ID, "title")
+    save = Element((By.ID, "missing"), (By.NAME, "save"))
+    rows = Elements(By.CSS_SELECTOR, "tr")
+    banner = Element(By.ID, "missing")
+
+    @navigates
+    def submit(self):
+        self.save.click()
+        self.driver.get("https://example.com/next")
+
+
+def make_page(monkeypatch):
+    monkeypatch.setattr(pages.base_page, 'locator_engine', LocatorEngine(stats_file=None, poll_interval=0))
+    return ExamplePage(FakeDriver(), timeout=0)
+
+
+def test_elements_are_found_once_per_page(monkeypatch):
+    page = make_page(monkeypatch)
+    assert page.title.text == 'title-0-0'
+    page.title.click()
+    page.title.click()
+    assert page.driver.lookups == [(By.ID, 'title')]
+    assert [row.text for row in page.rows] == ['tr-0-0', 'tr-0-1', 'tr-0-2']
+    assert page.driver.lookups.count((By.CSS_SELECTOR, 'tr')) == 1
+
+
+def test_stale_element_is_found_again(monkeypatch):
+    page = make_page(monkeypatch)
+    first = page.title.element
+    first.stale = True
+    page.driver.generation += 1  # The page re-rendered the element
+    assert page.title.text == 'title-1-0'
+    assert page.driver.lookups == [(By.ID, 'title'), (By.ID, 'title')]
+
+
+def test_navigation_invalidates_cache(monkeypatch):
+    page = make_page(monkeypatch).open()
+    assert page.title.text == 'title-1-0'
+    page.submit()
+    assert page.title.text == 'title-2-0'
+    assert page.is_present('title')
+    assert not page.is_present('banner', 0)
+
+
+def test_empty_element_list_is_waited_for_and_not_cached(monkeypatch):
+    page = make_page(monkeypatch)
+    page.timeout = 1
+    calls = []
+    rendered = FakeElement('row')
+
+    def find_elements(by, value):
+        calls.append(value)
+        return [rendered] if len(calls) >= 3 else []
+
+    page.driver.find_elements = find_elements
+    assert [row.text for row in page.rows] == ['row']  # Polled until the rows appeared
+    assert len(calls) == 3
+
+    page.invalidate()
+    page.timeout = 0
+    calls.clear()
+    page.driver.find_elements = lambda by, value: calls.append(value) or ([rendered] if len(calls) > 1 else [])
+    assert page.rows == []
+    assert len(page.rows) == 1  # The empty result was not cached
+
+
+def test_click_that_loads_a_new_document_drops_cached_elements(monkeypatch):
+    page = make_page(monkeypatch)
+    link = page.title.element
+    link.on_click = lambda: page.driver.get("https://example.com/next")
+    page.title.click()  # A plain element click, not a @navigates page method
+    assert page.title.text == 'title-1-0'
+    page.title.click()
+    assert page.driver.lookups == [(By.ID, 'title'), (By.ID, 'title')]
+
+
+def test_click_that_stays_on_the_document_keeps_cached_elements(monkeypatch):
+    page = make_page(monkeypatch)
+    page.title.click()
+    assert page.title.text == 'title-0-0'
+    assert page.driver.lookups == [(By.ID, 'title')]
+
+
+def test_element_list_handle_past_the_end_raises_no_such_element(monkeypatch):
+    page = make_page(monkeypatch)
+    last = page.rows[2]
+    last.element.stale = True
+    page.driver.elements[(By.CSS_SELECTOR, 'tr', 1)] = [FakeElement('tr-1-0')]
+    page.driver.generation += 1  # The table re-rendered with a single row
+    with pytest.raises(NoSuchElementException, match="matches 1 element"):
+        last.text
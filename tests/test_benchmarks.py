@@ -0,0 +1,24 @@
+from urllib.request import urlopen
+from benchmarks.run import compare, percentile, serve_site
+
+
+def test_fixture_site_is_served_locally():
+    server, base_url = serve_site()
+    try:
+        with urlopen(f"{base_url}/profile.html") as response:
+            assert b'id="firstName"' in response.read()
+    finally:
+        server.shutdown()
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+
+
+def test_compare_reports_median_regressions():
+    baseline = {'results': {'find_element': {'p50_ms': 10.0}, 'page_load': {'p50_ms': 100.0}}}
+    current = {'results': {'find_element': {'p50_ms': 13.0}, 'page_load': {'p50_ms': 101.0}}}
+    regressions = compare(current, baseline, max_regression=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('find_element')
@@ -0,0 +1,54 @@
+import os
+from utils.data_source import CSVDataSource
+from utils.form_registry import FormDefinition
+from utils.form_validation import validate
+from utils.test_data import RowGenerator, generate, main
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+PROFILE_FORM = os.path.join(ROOT, 'form_definitions', 'profilepage_form.csv')
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as file:
+        return file.read().splitlines()
+
+
+def test_rows_are_deterministic_and_typed():
+    generator = RowGenerator(FormDefinition.parse(PROFILE_FORM), seed=7)
+    row = dict(zip(generator.header, generator.row(42)))
+    assert generator.row(42) == RowGenerator(FormDefinition.parse(PROFILE_FORM), seed=7).row(42)
+    assert generator.row(42) != generator.row(43)
+    assert [row['Male'], row['Female'], row['Other']].count('checked') == 1
+    assert [row['Public Profile'], row['Friends Only'], row['Private']].count('checked') == 1
+    assert row['Email Address'].endswith('@example.com') and row['Username'] == 'user42'
+    assert row['Country'] in ('United States', 'Canada', 'United Kingdom', 'India')
+    assert row['Profile Picture'] == ''
+
+
+def test_sharded_output_matches_single_process_and_validates(tmp_path):
+    single = str(tmp_path / 'single.csv')
+    generate(PROFILE_FORM, single, rows=250, seed=3, batch_size=40)
+    shards = generate(PROFILE_FORM, str(tmp_path / 'sharded.csv'), rows=250, seed=3, workers=3, batch_size=40)
+    assert [os.path.basename(path) for path in shards] == [f'sharded-0000{index}.csv' for index in range(3)]
+    lines = read_lines(single)
+    assert lines[0] == read_lines(shards[0])[0]
+    assert lines[1:] == [line for shard in shards for line in read_lines(shard)[1:]]
+    assert [issue for issue in validate(PROFILE_FORM, single, cache_dir=None) if issue.level == 'error'] == []
+
+    merged = str(tmp_path / 'merged.csv.gz')
+    assert generate(PROFILE_FORM, merged, rows=250, seed=3, workers=2, merge=True) == [merged]
+    source = CSVDataSource(merged, index_dir=None)
+    assert len(source) == 250
+    assert source.row(249)['Username'] == 'user249'
+    source.close()
+
+
+def test_cli_accepts_select_options(tmp_path, capsys):
+    output = str(tmp_path / 'out.csv')
+    args = [PROFILE_FORM, output, '--rows', '5', '--option', 'Country=Narnia', '--option', 'Timezone=CET|UTC']
+    assert main(args) == 0
+    source = CSVDataSource(output, index_dir=None)
+    countries = {row['Country'] for row in source}
+    source.close()
+    assert countries == {'Narnia'}
+    assert capsys.readouterr().out.strip() == output
@@ -0,0 +1,50 @@
+import gzip
+import os
+from utils.csv_utils import CSVUtils
+from utils.data_source import CSVDataSource
+
+FORM_DATA = os.path.join(os.path.dirname(__file__), '..', 'form_data')
+
+CSV_TEXT = 'name,notes,age\nAnn,"line one\nline two",30\nBob,"say ""hi""",41\n\nCid,,52\n'
+
+
+def test_rows_match_csv_reader():
+    data_file = os.path.join(FORM_DATA, 'profile_page_data.csv')
+    source = CSVDataSource(data_file, index_dir=None)
+    expected = CSVUtils.read_csv(data_file)
+
+    assert [row.to_dict() for row in source] == expected
+    assert len(source) == len(expected)
+    assert source.row(1).get('Email Address') == 'janesmith@example.com'
+    source.close()
+
+
+def test_index_seeks_to_rows_with_quoted_newlines(tmp_path):
+    data_file = tmp_path / 'data.csv'
+    data_file.write_text(CSV_TEXT, encoding='utf-8')
+    index_dir = str(tmp_path / 'index')
+
+    assert len(CSVDataSource(str(data_file), index_dir=index_dir)) == 3
+    assert os.listdir(index_dir)
+
+    source = CSVDataSource(str(data_file), index_dir=index_dir)
+    assert source.row(0)['notes'] == 'line one\nline two'
+    assert source.row(2)['name'] == 'Cid'
+    assert source.row(1)['notes'] == 'say "hi"'
+    assert source.row(2).get('missing', '') == ''
+    source.close()
+
+
+def test_gzip_input(tmp_path):
+    data_file = tmp_path / 'data.csv.gz'
+    with gzip.open(data_file, 'wt', encoding='utf-8') as file:
+        file.write(CSV_TEXT)
+
+    with CSVDataSource(str(data_file), index_dir=str(tmp_path / 'index')) as source:
+        assert [row['age'] for row in source] == ['30', '41', '52']
+        assert source.row(1)['name'] == 'Bob'
+        # Seeking backwards reads the decompressed copy instead of decompressing again
+        assert source.row(0)['name'] == 'Ann'
+        assert not isinstance(source._file, gzip.GzipFile)
+    assert source._file is None
+    assert [row['age'] for row in CSVUtils.iter_csv(str(data_file))] == ['30', '41', '52']
@@ -0,0 +1,110 @@
+import gc
+import os
+import weakref
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils.downloads import DownloadWatcher, Downloader, domain_matches, downloader_for, path_matches
+from utils.helpers import SeleniumUtils
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+class RangeHandler(SimpleHTTPRequestHandler):
+    """Serves PAYLOAD at every path, honouring Range requests and requiring a session cookie."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if 'sid=abc' not in self.headers.get('Cookie', ''):
+            self.send_error(403)
+            return
+        start = 0
+        if self.headers.get('Range'):
+            start = int(self.headers['Range'].split('=')[1].rstrip('-'))
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = PAYLOAD[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeDriver:
+    def execute_script(self, script):
+        return "test-agent"
+
+    def get_cookies(self):
+        return [{'name': 'sid', 'value': 'abc', 'domain': '127.0.0.1', 'path': '/'},
+                {'name': 'other', 'value': 'x', 'domain': '.example.com', 'path': '/'}]
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_download_file_uses_browser_cookies(server, tmp_path):
+    path = SeleniumUtils(FakeDriver()).download_file(f"{server}/report.bin", str(tmp_path))
+    assert path == str(tmp_path / 'report.bin')
+    assert open(path, 'rb').read() == PAYLOAD
+
+
+def test_download_file_reuses_one_connection_pool_per_driver(server, tmp_path):
+    driver = FakeDriver()
+    SeleniumUtils(driver).download_file(f"{server}/a.bin", str(tmp_path))
+    SeleniumUtils(driver).download_file(f"{server}/b.bin", str(tmp_path))
+    pool = downloader_for(driver).http.connection_from_url(server)
+    assert pool.num_connections == 1 and pool.num_requests == 2
+
+
+def test_shared_downloader_does_not_keep_its_driver_alive():
+    driver = FakeDriver()
+    downloader_for(driver)
+    reference = weakref.ref(driver)
+    del driver
+    gc.collect()
+    assert reference() is None
+
+
+class CookieJarDriver(FakeDriver):
+    def get_cookies(self):
+        return [{'name': 'site', 'value': '1', 'domain': 'example.com', 'path': '/'},
+                {'name': 'admin', 'value': '2', 'domain': '.example.com', 'path': '/admin'}]
+
+
+def test_cookies_are_only_sent_to_their_domain_and_path():
+    downloader = Downloader(CookieJarDriver())
+    assert downloader.headers_for("https://example.com/admin/users")['Cookie'] == 'site=1; admin=2'
+    assert downloader.headers_for("https://files.example.com/admin")['Cookie'] == 'admin=2'
+    assert downloader.headers_for("https://example.com/administrator")['Cookie'] == 'site=1'
+    assert 'Cookie' not in downloader.headers_for("https://evilexample.com/admin")
+    assert not domain_matches('evilexample.com', '.example.com')
+    assert not domain_matches('files.example.com', 'example.com') and domain_matches('example.com', '.example.com')
+    assert not path_matches('/administrator', '/admin') and path_matches('/admin/', '/admin')
+
+
+def test_download_resumes_partial_file(server, tmp_path):
+    (tmp_path / 'report.bin.part').write_bytes(PAYLOAD[:1000])
+    path = Downloader(FakeDriver(), chunk_size=4096).download(f"{server}/report.bin", str(tmp_path))
+    assert open(path, 'rb').read() == PAYLOAD
+    assert not os.path.exists(path + '.part')
+
+
+def test_download_many_in_parallel(server, tmp_path):
+    urls = [f"{server}/export{i}.bin" for i in range(4)]
+    paths = Downloader(FakeDriver(), max_workers=2).download_many(urls, str(tmp_path))
+    assert paths == [str(tmp_path / f"export{i}.bin") for i in range(4)]
+    assert all(open(path, 'rb').read() == PAYLOAD for path in paths)
+
+
+def test_watcher_ignores_partial_files(tmp_path):
+    with DownloadWatcher(str(tmp_path), poll_interval=0.01) as watcher:
+        (tmp_path / 'export.csv.crdownload').write_text('partial')
+        (tmp_path / 'export.csv.crdownload').rename(tmp_path / 'export.csv')
+        assert watcher.wait(timeout=5) == str(tmp_path / 'export.csv')
@@ -0,0 +1,191 @@
+import time
+import threading
+import pytest
+from selenium.common.exceptions import WebDriverException
+from utils.driver_pool import _LAUNCH_FAILED, DriverPool, shard_rows
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    def __init__(self, broken=False):
+        self.window_handles = ['main']
+        self.switch_to = FakeSwitchTo(self)
+        self.cookies_cleared = 0
+        self.quit_called = False
+        self.broken = broken
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def execute_script(self, script):
+        pass
+
+    def delete_all_cookies(self):
+        if self.broken:
+            raise WebDriverException("browser crashed")
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_and_resets_drivers():
+    launched = []
+    pool = DriverPool(size=2, factory=lambda: launched.append(FakeDriver()) or launched[-1])
+
+    with pool.lease() as driver:
+        driver.window_handles.append('popup')
+    with pool.lease() as again:
+        assert again is driver
+    assert len(launched) == 1
+    assert driver.window_handles == ['main']
+    assert driver.cookies_cleared == 2
+
+    pool.close()
+    assert driver.quit_called
+
+
+def test_pool_discards_driver_that_fails_to_reset():
+    pool = DriverPool(size=1, factory=lambda: FakeDriver(broken=True))
+    driver = pool.acquire()
+    pool.release(driver)
+    assert driver.quit_called
+    assert pool.acquire() is not driver
+
+
+def test_map_rows_runs_every_row():
+    pool = DriverPool(size=3, factory=FakeDriver)
+    assert pool.map_rows(lambda driver, row: row * 2, [1, 2, 3, 4]) == [2, 4, 6, 8]
+    pool.close()
+
+
+def test_shard_rows_splits_rows_round_robin():
+    rows = list(range(7))
+    assert shard_rows(rows, 0, 3) == [0, 3, 6]
+    assert shard_rows(rows, 2, 3) == [2, 5]
+
+
+def test_prewarmed_browsers_are_leased_without_cold_start():
+    release_launch = threading.Event()
+    launched = []
+
+    def slow_factory():
+        release_launch.wait(5)
+        launched.append(FakeDriver())
+        return launched[-1]
+
+    pool = DriverPool(size=2, factory=slow_factory)
+    assert pool.prewarm(5) == 2
+    release_launch.set()
+    first, second = pool.acquire(timeout=5), pool.acquire(timeout=5)
+    assert {id(first), id(second)} == {id(driver) for driver in launched}
+    assert len(launched) == 2
+    pool.close()
+
+
+def test_pool_keeps_spare_browsers_warm():
+    pool = DriverPool(size=3, factory=FakeDriver, spares=1)
+    pool.acquire()
+    assert pool.acquire(timeout=5) is not None
+    pool.close()
+
+
+def test_failed_background_launch_does_not_block_acquire():
+    attempts = []
+
+    def flaky_factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise WebDriverException("chromedriver not found")
+        return FakeDriver()
+
+    pool = DriverPool(size=1, factory=flaky_factory)
+    pool.prewarm()
+    assert isinstance(pool.acquire(timeout=5), FakeDriver)
+    pool.close()
+
+
+def test_acquire_times_out_when_every_browser_is_leased():
+    pool = DriverPool(size=1, factory=FakeDriver)
+    pool.acquire()
+    with pytest.raises(TimeoutError, match="pool size 1, 1 leased"):
+        pool.acquire(timeout=0.05)
+
+
+def test_acquire_launches_while_a_prewarm_is_still_running():
+    release_prewarm = threading.Event()
+
+    def factory():
+        if threading.current_thread().name == 'driver-prewarm':
+            release_prewarm.wait(5)
+        return FakeDriver()
+
+    pool = DriverPool(size=2, factory=factory)
+    pool.prewarm(1)
+    started = time.monotonic()
+    assert isinstance(pool.acquire(timeout=5), FakeDriver)
+    assert time.monotonic() - started < 1
+    release_prewarm.set()
+    pool.close()
+
+
+class CdpDriver(FakeDriver):
+    """A Chromium-like driver whose tabs each have their own navigation history."""
+
+    def __init__(self):
+        super().__init__()
+        self.window_handles = ['main', 'popup']
+        self.history = {'main': ['https://app.example.com/login', 'https://sso.example.org/auth'],
+                        'popup': ['https://cdn.example.net/help', 'about:blank']}
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        if cmd == 'Page.getNavigationHistory':
+            return {'entries': [{'url': url} for url in self.history[self.current]]}
+        return {}
+
+
+def test_reset_clears_cookies_and_storage_of_every_visited_origin():
+    driver = CdpDriver()
+    pool = DriverPool(size=1, factory=lambda: driver)
+    pool.release(pool.acquire())
+    assert driver.window_handles == ['main']
+    assert ('Network.clearBrowserCookies', {}) in driver.commands
+    cleared = [params['origin'] for cmd, params in driver.commands if cmd == 'Storage.clearDataForOrigin']
+    assert cleared == ['https://app.example.com', 'https://cdn.example.net', 'https://sso.example.org']
+    pool.close()
+
+
+def test_leased_ignores_failed_launches_and_close_wakes_every_waiter():
+    pool = DriverPool(size=1, factory=FakeDriver)
+    pool.acquire()
+    pool._idle.put(_LAUNCH_FAILED)
+    assert pool.leased() == 1
+
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiters = [threading.Thread(target=wait) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    for waiter in waiters:
+        waiter.join(0.3)
+    assert len(errors) == 3
@@ -0,0 +1,71 @@
+import pytest
+from selenium.webdriver.chrome.service import Service
+from config.driver_setup import SharedService, build_options, get_profile
+
+
+def test_profiles_are_loaded_from_config():
+    fast = get_profile('fast')
+    assert fast['headless'] is True
+    assert fast['page_load_strategy'] == 'eager'
+    assert '*google-analytics.com*' in fast['blocked_urls']
+    assert get_profile('gui')['headless'] is False
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Available"):
+        get_profile('missing')
+
+
+def test_options_follow_profile():
+    options = build_options(get_profile('fast'))
+    assert '--headless=new' in options.arguments
+    assert '--window-size=1920,1080' in options.arguments
+    assert '--blink-settings=imagesEnabled=false' in options.arguments
+    assert options.page_load_strategy == 'eager'
+    assert options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+
+
+def test_user_data_dir_is_copied_from_template(tmp_path):
+    template = tmp_path / 'template'
+    template.mkdir()
+    (template / 'Local State').write_text('{}')
+    options = build_options(dict(get_profile('headless'), user_data_dir_template=str(template)))
+    user_data_dir = next(arg.split('=', 1)[1] for arg in options.arguments if arg.startswith('--user-data-dir='))
+    assert open(f"{user_data_dir}/Local State").read() == '{}'
+
+
+def test_network_proxy_routes_browser_through_local_proxy():
+    options = build_options(dict(get_profile('headless'), network_proxy=True))
+    proxy_args = [arg for arg in options.arguments if arg.startswith('--proxy-server=http://127.0.0.1:')]
+    assert len(proxy_args) == 1
+
+
+def test_each_block_list_gets_its_own_proxy():
+    def proxy_url(profile):
+        options = build_options(dict(get_profile(profile), network_proxy=True))
+        return next(arg for arg in options.arguments if arg.startswith('--proxy-server='))
+
+    assert proxy_url('fast') != proxy_url('headless')
+    assert proxy_url('fast') == proxy_url('fast')
+
+
+def test_shared_service_starts_once_and_survives_browser_quit(monkeypatch):
+    class RunningProcess:
+        def poll(self):
+            return None
+
+    started, stopped = [], []
+
+    def start(service):
+        started.append(service)
+        service.process = RunningProcess()
+
+    monkeypatch.setattr(Service, 'start', start)
+    monkeypatch.setattr(Service, 'stop', lambda service: stopped.append(service))
+    service = SharedService()
+    service.start()
+    service.start()
+    service.stop()  # What ChromiumDriver.quit() calls
+    assert started == [service] and stopped == []
+    service.shutdown()
+    assert stopped == [service]
@@ -1,47 +1,55 @@
 import pytest
 import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from utils.form_handler import FormHandler
 from utils.helpers import SeleniumUtils
-from utils.csv_utils import CSVUtils
+from utils.data_source import CSVDataSource
 
 
-@pytest.fixture(scope="session")
-def driver():
-    driver = webdriver.Chrome()
-    yield driver
-    driver.quit()
+@pytest.fixture(scope="module")
+def selenium_utils(module_driver, artifact_pipeline):
+    return SeleniumUtils(module_driver, artifacts=artifact_pipeline)
 
 
-@pytest.fixture(scope="session")
-def selenium_utils(driver):
-    return SeleniumUtils(driver)
+@pytest.fixture(scope="module")
+def form_handler(module_driver):
+    return FormHandler(module_driver)
 
 
-@pytest.fixture(scope="session")
-def form_handler(driver):
-    return FormHandler(driver)
+FIELDS_FILE = os.path.join(os.path.dirname(__file__), '..', 'form_definitions', 'profilepage_form.csv')
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'form_data', 'profile_page_data.csv')
 
+# Definition and data are checked against each other at collection time, before any browser starts
+pytestmark = pytest.mark.form_dataset(FIELDS_FILE, DATA_FILE)
 
-# Reading test data from CSV file
+
+# Test data is streamed from the CSV file; tests are parametrized by row number only
 def get_test_data():
-    data_file = os.path.join(os.path.dirname(__file__), '..', 'form_data', 'profile_page_data.csv')
-    return CSVUtils.read_csv(data_file)
+    return CSVDataSource(DATA_FILE)
 
 
-@pytest.mark.parametrize("test_data", get_test_data())
-def test_login_form(form_handler, selenium_utils, test_data):
-    driver = form_handler.driver
-    driver.get("https://automationtestingpractice.netlify.app/")
-    selenium_utils.maximize_window()
-    selenium_utils.wait(5)
+test_data_source = get_test_data()
 
-    # Using FormHandler to fill the form from CSV
-    fields_file = os.path.join(os.path.dirname(__file__), '..', 'form_definitions', 'profilepage_form.csv')
 
-    # Pass only the current row data to the FormHandler
-    form_handler.fill_form(fields_file, test_data)
+@pytest.fixture(scope="module", autouse=True)
+def close_test_data_source():
+    # Releases the file row() keeps open once the module's rows have run
+    yield
+    test_data_source.close()
+
+
+@pytest.mark.parametrize("row", test_data_source.row_ids())
+def test_login_form(form_handler, selenium_utils, row):
+    test_data = test_data_source.row(row)
+    # Reset the form in place when the previous row left the browser on it, otherwise load it
+    form_handler.open_form("https://automationtestingpractice.netlify.app/", FIELDS_FILE,
+                           ready=lambda: selenium_utils.wait(5))
+
+    # Using FormHandler to fill the form from CSV
+    # Pass only the current row data to the FormHandler, applying all fields in one round trip
+    results = form_handler.fill_form(FIELDS_FILE, test_data, batched=True)
+    failed = [r for r in results if r['status'] in ('missing', 'error')]
+    assert not failed, f"Fields not filled: {failed}"
     selenium_utils.wait(8)
     # Click the submit button
     selenium_utils.click_element((By.XPATH,"//button[text()='Submit']"))
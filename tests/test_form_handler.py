@@ -0,0 +1,78 @@
+import os
+from selenium.webdriver.common.by import By
+from utils.form_handler import FormHandler
+from utils.locator_engine import LocatorEngine
+from utils.scripts import FILL_FORM_JS
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+LOGIN_FORM = os.path.join(ROOT, 'form_definitions', 'login_form.csv')
+HEADER = "page,field_name,field_type,id_locator,xpath_locator,linktext_locator,partiallinktext_locator," \
+         "name_locator,tagname_locator,classname_locator,cssselector_locator\n"
+
+
+class FakeElement:
+    def __init__(self):
+        self.keys = []
+
+    def clear(self):
+        self.keys = []
+
+    def send_keys(self, text):
+        self.keys.append(text)
+
+
+class FakeDriver:
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.scripts = []
+        self.elements = {}
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        return self.outcomes
+
+    def find_elements(self, by, value):
+        return [self.elements.setdefault((by, value), FakeElement())]
+
+
+def make_handler(outcomes):
+    driver = FakeDriver(outcomes)
+    return driver, FormHandler(driver, engine=LocatorEngine(stats_file=None, poll_interval=0))
+
+
+def test_batched_fill_is_one_round_trip_with_per_field_results():
+    driver, handler = make_handler([['username', 'filled', ''], ['password', 'filled', '']])
+    results = handler.fill_form(LOGIN_FORM, {'username': ' Admin ', 'password': 'admin123'}, batched=True)
+
+    assert len(driver.scripts) == 1
+    script, (entries,) = driver.scripts[0]
+    assert script == FILL_FORM_JS
+    assert entries == [['username', 'text', [[By.NAME, 'username']], 'Admin'],
+                       ['password', 'password', [[By.NAME, 'password']], 'admin123']]
+    assert results == [{'field': 'username', 'type': 'text', 'status': 'filled', 'message': ''},
+                       {'field': 'password', 'type': 'password', 'status': 'filled', 'message': ''}]
+    assert driver.elements == {}
+
+
+def test_empty_values_are_not_sent():
+    driver, handler = make_handler([['username', 'filled', '']])
+    handler.fill_form(LOGIN_FORM, {'username': 'Admin', 'password': '  '}, batched=True)
+    assert [entry[0] for entry in driver.scripts[0][1][0]] == ['username']
+    assert handler.fill_form(LOGIN_FORM, {}, batched=True) == []
+    assert len(driver.scripts) == 1
+
+
+def test_fields_the_script_could_not_find_fall_back_to_per_field_fill(tmp_path):
+    definition = tmp_path / 'form.csv'
+    definition.write_text(HEADER + "p,username,text,,,,,username,,,\n"
+                                   "p,password,password,,,,,password,,,\n"
+                                   "p,avatar,file,avatar,,,,,,,\n", encoding='utf-8')
+    driver, handler = make_handler([['username', 'filled', ''], ['password', 'missing', 'element not found'],
+                                    ['avatar', 'missing', 'element not found']])
+    results = handler.fill_form(str(definition), {'username': 'Admin', 'password': 'secret', 'avatar': 'me.png'},
+                                batched=True)
+
+    assert [(result['field'], result['status']) for result in results] == [
+        ('username', 'filled'), ('password', 'filled'), ('avatar', 'skipped')]
+    assert driver.elements[(By.NAME, 'password')].keys == ['secret']
+    assert (By.NAME, 'username') not in driver.elements
@@ -0,0 +1,48 @@
+import os
+from selenium.webdriver.common.by import By
+from utils.form_registry import FormRegistry
+
+FORM_DEFINITIONS = os.path.join(os.path.dirname(__file__), '..', 'form_definitions')
+
+
+def write_definition(path, rows):
+    header = "page,field_name,field_type,id_locator,xpath_locator,linktext_locator,partiallinktext_locator," \
+             "name_locator,tagname_locator,classname_locator,cssselector_locator\n"
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(header + "\n".join(rows) + "\n")
+
+
+def test_definition_is_parsed_into_typed_fields(tmp_path):
+    registry = FormRegistry(cache_dir=str(tmp_path))
+    definition = registry.get(os.path.join(FORM_DEFINITIONS, 'profilepage_form.csv'))
+
+    first_name = definition.fields[0]
+    assert first_name.name == 'First Name'
+    assert first_name.locator == (By.ID, 'firstName')
+    assert first_name.locators[1] == (By.XPATH, "//input[@id='firstName']")
+    assert first_name.action == 'enter_text'
+    assert {field.action for field in definition if field.field_type == 'file'} == {None}
+
+
+def test_definition_is_cached_until_mtime_changes(tmp_path):
+    fields_file = tmp_path / 'form.csv'
+    write_definition(fields_file, ["login,username,text,,,,,username,,,"])
+    registry = FormRegistry(cache_dir=str(tmp_path / 'cache'))
+
+    first = registry.get(str(fields_file))
+    assert registry.get(str(fields_file)) is first
+
+    write_definition(fields_file, ["login,username,text,,,,,username,,,", "login,password,password,,,,,password,,,"])
+    os.utime(fields_file, ns=(first.mtime + 10 ** 9, first.mtime + 10 ** 9))
+    assert [field.name for field in registry.get(str(fields_file))] == ['username', 'password']
+
+
+def test_pickle_cache_is_shared_between_registries(tmp_path):
+    fields_file = tmp_path / 'form.csv'
+    write_definition(fields_file, ["login,username,text,,,,,username,,,"])
+    cache_dir = str(tmp_path / 'cache')
+    FormRegistry(cache_dir=cache_dir).get(str(fields_file))
+    assert len(os.listdir(cache_dir)) == 1
+
+    definition = FormRegistry(cache_dir=cache_dir).get(str(fields_file))
+    assert definition.fields[0].locator == (By.NAME, 'username')
@@ -0,0 +1,42 @@
+import os
+from utils.form_handler import FormHandler
+
+FIELDS_FILE = os.path.join(os.path.dirname(__file__), '..', 'form_definitions', 'login_form.csv')
+URL = "https://example.com/login"
+
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = list(results)
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script, *args):
+        return self.results.pop(0)
+
+
+def test_first_row_loads_page_and_records_baseline():
+    driver = FakeDriver([[True, 'pristine']])
+    ready = []
+    assert not FormHandler(driver).open_form(URL, FIELDS_FILE, ready=lambda: ready.append(1))
+    assert driver.visited == [URL]
+    assert ready == [1]
+
+
+def test_next_row_resets_in_place_when_fingerprint_matches():
+    driver = FakeDriver([[True, 'pristine'], [True, 'pristine']])
+    handler = FormHandler(driver)
+    handler.open_form(URL, FIELDS_FILE)
+    assert handler.open_form(URL, FIELDS_FILE)
+    assert driver.visited == [URL]
+
+
+def test_falls_back_to_reload_when_reset_cannot_be_verified():
+    driver = FakeDriver([[True, 'pristine'], [True, 'still dirty'], [True, 'pristine'], [False, None], [True, 'pristine']])
+    handler = FormHandler(driver)
+    handler.open_form(URL, FIELDS_FILE)
+    assert not handler.open_form(URL, FIELDS_FILE)
+    assert not handler.open_form(URL, FIELDS_FILE)
+    assert driver.visited == [URL, URL, URL]
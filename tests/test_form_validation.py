@@ -0,0 +1,52 @@
+import os
+from utils.form_validation import main, validate
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+HEADER = "page,field_name,field_type,id_locator,xpath_locator,linktext_locator,partiallinktext_locator," \
+         "name_locator,tagname_locator,classname_locator,cssselector_locator\n"
+
+
+def errors(issues):
+    return [issue.message for issue in issues if issue.level == 'error']
+
+
+def test_repository_datasets_are_valid(tmp_path):
+    for definition, data in (('login_form.csv', 'login_data.csv'), ('profilepage_form.csv', 'profile_page_data.csv')):
+        issues = validate(os.path.join(ROOT, 'form_definitions', definition), os.path.join(ROOT, 'form_data', data),
+                          cache_dir=str(tmp_path))
+        assert errors(issues) == []
+
+
+def test_mismatches_are_reported(tmp_path):
+    definition = tmp_path / 'form.csv'
+    definition.write_text(HEADER + "p,username,text,,,,,username,,,\n"
+                                   "p,agree,checkbox,agree,,,,,,,\n"
+                                   "p,nickname,textarea,nick,,,,,,,\n"
+                                   "p,city,text,,,,,,,,\n", encoding='utf-8')
+    data = tmp_path / 'data.csv'
+    data.write_text("username,agree,Username \nbob,yes,x\n", encoding='utf-8')
+
+    messages = errors(validate(str(definition), str(data), cache_dir=None))
+    assert "unknown field_type 'textarea' for 'nickname'" in messages
+    assert "no locator for field 'city'" in messages
+    assert "column 'Username ' is not defined by the form" in messages
+    assert "'agree' must be checked or unchecked, got 'yes'" in messages
+
+
+def test_results_are_cached_by_content(tmp_path):
+    definition = tmp_path / 'form.csv'
+    definition.write_text(HEADER + "p,city,text,,,,,,,,\n", encoding='utf-8')
+    cache_dir = tmp_path / 'cache'
+    first = validate(str(definition), cache_dir=str(cache_dir))
+    assert len(os.listdir(cache_dir)) == 1
+    assert validate(str(definition), cache_dir=str(cache_dir)) == first
+
+    definition.write_text(HEADER + "p,city,text,city,,,,,,,\n", encoding='utf-8')
+    assert errors(validate(str(definition), cache_dir=str(cache_dir))) == []
+
+
+def test_command_line_exit_status(tmp_path, capsys):
+    definition = tmp_path / 'form.csv'
+    definition.write_text(HEADER + "p,city,select,,,,,,,,\n", encoding='utf-8')
+    assert main([str(definition)]) == 1
+    assert "no locator for field 'city'" in capsys.readouterr().out
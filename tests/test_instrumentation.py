@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from utils.helpers import SeleniumUtils
+from utils import helpers, instrumentation, pytest_profiler
+from utils.instrumentation import CommandProfiler
+from utils.locator_engine import LocatorEngine
+
+
+class FakeExecutor:
+    def execute(self, command, params):
+        return {'value': [] if command == 'findElements' else None}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+    def find_elements(self, by, value):
+        return self.command_executor.execute('findElements', {'using': by, 'value': value})['value']
+
+
+def test_commands_are_recorded_with_locator_and_helper(tmp_path):
+    profiler = CommandProfiler()
+    driver = profiler.instrument(FakeDriver())
+    profiler.current_test = 'tests/test_x.py::test_a'
+
+    driver.find_elements(By.ID, 'a')
+
+    record = profiler.records[0]
+    assert record.command == 'findElements'
+    assert record.locator == 'id=a'
+    assert record.test == 'tests/test_x.py::test_a'
+    assert record.payload_bytes > 0
+    assert profiler.summary()['findElements'][0] == 1
+
+    paths = profiler.write_folded(str(tmp_path))
+    with open(paths[0], encoding='utf-8') as file:
+        assert file.read().startswith('tests/test_x.py::test_a;findElements ')
+
+
+def test_helper_frames_are_attributed(tmp_path, monkeypatch):
+    monkeypatch.setattr(helpers, 'locator_engine', LocatorEngine(stats_file=str(tmp_path / 'stats.json')))
+    profiler = CommandProfiler()
+    driver = profiler.instrument(FakeDriver())
+    with pytest.raises(TimeoutException):
+        SeleniumUtils(driver).find_element([(By.ID, 'a')], timeout=0)
+    assert profiler.records[0].stack[0] == 'SeleniumUtils.find_element'
+    assert profiler.records[0].helper == 'LocatorEngine.find'
+
+
+def test_worker_summaries_reach_the_controller(tmp_path, monkeypatch):
+    worker = CommandProfiler()
+    driver = worker.instrument(FakeDriver())
+    driver.find_elements(By.ID, 'a')
+    driver.find_elements(By.ID, 'b')
+    monkeypatch.setattr(instrumentation, '_profiler', worker)
+    monkeypatch.setattr(pytest_profiler, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setattr(pytest_profiler, '_worker_summaries', [])
+    config = SimpleNamespace(workerinput={'workerid': 'gw0'}, workeroutput={})
+    pytest_profiler.pytest_sessionfinish(SimpleNamespace(config=config))
+
+    # On the controller: no local records, only what the workers sent back
+    monkeypatch.setattr(instrumentation, '_profiler', CommandProfiler())
+    for _ in range(2):
+        pytest_profiler.pytest_testnodedown(SimpleNamespace(workeroutput=config.workeroutput), None)
+    assert pytest_profiler.collected_summary('command')['findElements'][0] == 4
+    assert [name for name, _ in pytest_profiler.summary_rows('helper')] == ['<direct>']
@@ -0,0 +1,68 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from utils.locator_engine import LocatorEngine, chain_key
+
+ID = (By.ID, 'firstName')
+XPATH = (By.XPATH, "//input[@id='firstName']")
+
+
+class FakeDriver:
+    def __init__(self, present):
+        self.present = present
+        self.lookups = []
+
+    def find_elements(self, by, value):
+        self.lookups.append((by, value))
+        return ['element'] if (by, value) in self.present else []
+
+
+def test_falls_back_to_next_locator_and_promotes_it(tmp_path):
+    stats_file = str(tmp_path / 'stats.json')
+    engine = LocatorEngine(stats_file=stats_file)
+    driver = FakeDriver(present=[XPATH])
+
+    assert engine.find(driver, [ID, XPATH], timeout=0) == 'element'
+    assert driver.lookups == [ID, XPATH]
+    assert engine.order([ID, XPATH]) == [XPATH, ID]
+
+    engine.save()
+    assert LocatorEngine(stats_file=stats_file).order([ID, XPATH]) == [XPATH, ID]
+
+
+def test_faster_working_locator_is_tried_first(tmp_path):
+    engine = LocatorEngine(stats_file=str(tmp_path / 'stats.json'))
+    engine.record(chain_key([ID, XPATH]), ID, True, 5.0)
+    engine.record(chain_key([ID, XPATH]), XPATH, True, 1.0)
+    assert engine.order([ID, XPATH]) == [XPATH, ID]
+
+
+def test_raises_timeout_when_no_locator_matches(tmp_path):
+    engine = LocatorEngine(stats_file=str(tmp_path / 'stats.json'), poll_interval=0)
+    with pytest.raises(TimeoutException):
+        engine.find(FakeDriver(present=[]), [ID, XPATH], timeout=0.05)
+
+
+def test_ambiguous_locator_is_not_promoted_over_specific_one(tmp_path):
+    engine = LocatorEngine(stats_file=str(tmp_path / 'stats.json'))
+    tag = (By.TAG_NAME, 'input')
+    engine.record(chain_key([ID, tag]), ID, True, 5.0)
+    engine.record(chain_key([ID, tag]), tag, True, 1.0, unique=False)
+    assert engine.order([ID, tag]) == [ID, tag]
+
+
+def test_saves_from_several_workers_are_merged(tmp_path):
+    stats_file = str(tmp_path / 'stats.json')
+    key = chain_key([ID, XPATH])
+    first, second = LocatorEngine(stats_file=stats_file), LocatorEngine(stats_file=stats_file)
+    first.record(key, ID, True, 2.0)
+    second.record(key, ID, True, 4.0)
+    second.record(key, XPATH, False, 1.0)
+    first.save()
+    second.save()
+    second.save()  # Nothing new to add
+
+    merged = LocatorEngine(stats_file=stats_file).stats([ID, XPATH])
+    assert merged[f"{ID[0]}={ID[1]}"]['hits'] == 2
+    assert merged[f"{ID[0]}={ID[1]}"]['avg_ms'] == 3.0
+    assert merged[f"{XPATH[0]}={XPATH[1]}"]['misses'] == 1
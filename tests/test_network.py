@@ -0,0 +1,93 @@
+import base64
+import urllib.request
+from benchmarks.run import serve_site
+from utils.network import AssetCache, BlockingProxy, LRUCache, get_proxy
+
+
+def fetch(proxy, url):
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({'http': proxy.url}))
+    with opener.open(url) as response:
+        return response.status, response.read()
+
+
+def test_lru_cache_evicts_by_size():
+    cache = LRUCache(max_bytes=10)
+    cache.put('a', 200, {}, b'12345')
+    cache.put('b', 200, {}, b'12345')
+    cache.get('a')
+    cache.put('c', 200, {}, b'123')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.size == 8
+
+
+class FakeSession:
+    """Records CDP commands and answers Fetch.getResponseBody with a gzip-decoded stylesheet."""
+
+    closed = False
+
+    def __init__(self):
+        self.handlers = {}
+        self.commands = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def send(self, method, params=None):
+        self.commands.append((method, params))
+        if method == 'Fetch.getResponseBody':
+            return {'body': base64.b64encode(b'body{}').decode(), 'base64Encoded': True}
+        return {}
+
+    def pause(self, request_id, url, **response):
+        self.handlers['Fetch.requestPaused']({'requestId': request_id,
+                                              'request': {'url': url, 'method': 'GET'}, **response})
+
+
+def test_https_assets_are_fulfilled_from_cache_after_first_response():
+    session = FakeSession()
+    assets = AssetCache(session, LRUCache(1024))
+    assert session.commands[0][0] == 'Fetch.enable'
+    url = 'https://app.example.com/site.css'
+    headers = [{'name': 'Content-Type', 'value': 'text/css'}, {'name': 'Content-Encoding', 'value': 'gzip'}]
+
+    session.pause('1', url)
+    session.pause('1', url, responseStatusCode=200, responseHeaders=headers)
+    session.pause('2', url)
+    assert [method for method, _ in session.commands[1:]] == [
+        'Fetch.continueRequest', 'Fetch.getResponseBody', 'Fetch.continueRequest', 'Fetch.fulfillRequest']
+    fulfilled = session.commands[-1][1]
+    assert fulfilled['requestId'] == '2' and base64.b64decode(fulfilled['body']) == b'body{}'
+    assert fulfilled['responseHeaders'] == [{'name': 'Content-Type', 'value': 'text/css'}]
+    assert assets.stats() == {'cache': 1, 'network': 1}
+
+
+def test_uncacheable_responses_are_not_stored():
+    session = FakeSession()
+    assets = AssetCache(session, LRUCache(1024))
+    url = 'https://app.example.com/app.js'
+    session.pause('1', url, responseStatusCode=200, responseHeaders=[{'name': 'Cache-Control', 'value': 'no-store'}])
+    session.pause('2', url)
+    assert len(assets.cache) == 0
+    assert session.commands[-1] == ('Fetch.continueRequest', {'requestId': '2'})
+
+
+def test_requests_are_forwarded_and_patterns_blocked():
+    server, base_url = serve_site()
+    proxy = BlockingProxy(blocked_urls=['*analytics*']).start()
+    try:
+        status, body = fetch(proxy, f"{base_url}/assets/site.css")
+        assert status == 200 and body
+        assert fetch(proxy, f"{base_url}/assets/site.css") == (status, body)
+        assert fetch(proxy, f"{base_url}/analytics.js") == (204, b'')
+        assert proxy.stats() == {'network': 2, 'blocked': 1}
+    finally:
+        proxy.stop()
+        server.shutdown()
+
+
+def test_proxies_are_shared_only_between_identical_block_lists():
+    trackers = get_proxy(['*analytics*'])
+    assert get_proxy(('*analytics*',)) is trackers
+    assert get_proxy(()) is not trackers
+    assert get_proxy(()).blocked_urls == ()
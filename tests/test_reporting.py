@@ -0,0 +1,64 @@
+import os
+import json
+from types import SimpleNamespace
+from utils.reporting import ResultStream, read_stream, render_report
+
+
+def report(nodeid, when, outcome='passed', duration=0.1, longrepr=None, properties=()):
+    return SimpleNamespace(nodeid=nodeid, when=when, duration=duration, longrepr=longrepr,
+                           passed=outcome == 'passed', failed=outcome == 'failed', skipped=outcome == 'skipped',
+                           user_properties=list(properties), start=1.0)
+
+
+def run_test(stream, nodeid, call_outcome='passed', **call):
+    stream.add(report(nodeid, 'setup'))
+    stream.add(report(nodeid, 'call', call_outcome, **call))
+    stream.add(report(nodeid, 'teardown'))
+
+
+def load_page(path):
+    text = open(path, encoding='utf-8').read()
+    return json.loads(text[text.index('['):text.rindex(']') + 1])
+
+
+def test_results_stream_per_worker_and_render_in_pages(tmp_path):
+    stream_dir, report_dir = str(tmp_path / 'stream'), str(tmp_path / 'report')
+    screenshot = str(tmp_path / 'artifacts' / 'shot.png')
+    first, second = ResultStream(stream_dir, 'gw0'), ResultStream(stream_dir, 'gw1')
+    for row in range(5):
+        run_test(first, f"tests/test_form.py::test_row[{row}]")
+    run_test(second, "tests/test_form.py::test_broken", 'failed', longrepr='AssertionError: boom',
+             properties=[('screenshot', screenshot)])
+    second.add(report("tests/test_form.py::test_hung", 'setup'))
+    first.close()
+    second.close()
+
+    entries = list(read_stream(stream_dir))
+    assert len(entries) == 7
+    assert sorted(os.listdir(stream_dir)) == ['results-gw0.jsonl', 'results-gw1.jsonl']
+
+    index = render_report(stream_dir, report_dir, page_size=3)
+    assert os.path.basename(index) == 'index.html'
+    pages = sorted(name for name in os.listdir(report_dir) if name.startswith('all-'))
+    assert pages == ['all-0.js', 'all-1.js', 'all-2.js']
+    problems = load_page(os.path.join(report_dir, 'problems-0.js'))
+    assert [(entry['nodeid'], entry['outcome']) for entry in problems] == [
+        ('tests/test_form.py::test_broken', 'failed'), ('tests/test_form.py::test_hung', 'interrupted')]
+    assert problems[0]['properties']['screenshot'] == '../artifacts/shot.png'
+    assert problems[0]['longrepr'] == 'AssertionError: boom'
+    assert abs(problems[0]['duration'] - 0.3) < 1e-9
+    summary = open(os.path.join(report_dir, 'summary.js'), encoding='utf-8').read()
+    assert '"passed": 5' in summary and '"failed": 1' in summary and '"interrupted": 1' in summary
+
+
+def test_render_tolerates_partial_lines_and_replaces_old_pages(tmp_path):
+    stream_dir, report_dir = tmp_path / 'stream', tmp_path / 'report'
+    stream_dir.mkdir()
+    report_dir.mkdir()
+    (report_dir / 'all-7.js').write_text('stale', encoding='utf-8')
+    (stream_dir / 'results-main.jsonl').write_text(
+        json.dumps({'nodeid': 't', 'outcome': 'passed', 'duration': 1.0, 'properties': {}}) + '\n{"nodeid": "cut',
+        encoding='utf-8')
+    render_report(str(stream_dir), str(report_dir))
+    assert sorted(name for name in os.listdir(report_dir) if name.endswith('.js')) == [
+        'all-0.js', 'problems-0.js', 'summary.js']
@@ -0,0 +1,39 @@
+from utils.scheduling import RECENT_RUNS, RunHistory, lpt_partition, order_nodeids
+
+
+def test_lpt_partition_balances_total_duration():
+    weights = {'a': 7, 'b': 5, 'c': 4, 'd': 3, 'e': 3, 'f': 2}
+    bins = lpt_partition(weights, 2)
+    totals = sorted(sum(weights[key] for key in group) for group in bins)
+    assert totals == [12, 12]
+    assert sorted(key for group in bins for key in group) == sorted(weights)
+    assert lpt_partition(weights, 2) == bins
+
+
+def test_history_orders_recent_failures_then_fast_tests(tmp_path):
+    history_file = str(tmp_path / 'history.json')
+    history = RunHistory(history_file)
+    history.record('tests/test_a.py::slow', 9.0, False)
+    history.record('tests/test_a.py::fast', 0.5, False)
+    history.record('tests/test_b.py::test_row[0]', 3.0, True)
+    history.record('tests/test_b.py::test_row[1]', 1.0, False)
+    history.save()
+
+    reloaded = RunHistory(history_file)
+    assert reloaded.recently_failed('tests/test_b.py::test_row[0]')
+    nodeids = ['tests/test_a.py::slow', 'tests/test_a.py::fast', 'tests/test_a.py::new',
+               'tests/test_b.py::test_row[1]', 'tests/test_b.py::test_row[0]']
+    assert order_nodeids(nodeids, reloaded) == [
+        'tests/test_b.py::test_row[0]', 'tests/test_b.py::test_row[1]',
+        'tests/test_a.py::fast', 'tests/test_a.py::new', 'tests/test_a.py::slow']
+    assert reloaded.estimates(['tests/test_a.py::new'])['tests/test_a.py::new'] == 4.75
+
+
+def test_failures_stop_counting_as_recent_and_durations_are_smoothed(tmp_path):
+    history = RunHistory(str(tmp_path / 'history.json'))
+    history.record('t', 10.0, True)
+    for _ in range(RECENT_RUNS + 1):
+        history.save()
+    history.record('t', 20.0, False)
+    assert not history.recently_failed('t')
+    assert history.estimates(['t'])['t'] == 13.0
@@ -0,0 +1,52 @@
+import time
+from utils.session_cache import SessionCache
+
+
+class FakeDriver:
+    def __init__(self, cookies=None, storage=None):
+        self.cookies = list(cookies or [])
+        self.storage = storage or [{}, {}]
+        self.visited = []
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script, *args):
+        if args:
+            self.storage = [dict(args[0]), dict(args[1])]
+        return self.storage
+
+
+def test_captured_state_is_restored_into_fresh_driver(tmp_path):
+    cache = SessionCache(cache_dir=str(tmp_path))
+    cache.capture(FakeDriver([{'name': 'sid', 'value': 'abc'}], [{'token': 't'}, {'tab': '1'}]),
+                  'Admin', 'https://example.com')
+
+    fresh = FakeDriver()
+    assert cache.restore(fresh, 'Admin', 'https://example.com', 'https://example.com/home')
+    assert fresh.cookies == [{'name': 'sid', 'value': 'abc'}]
+    assert fresh.storage == [{'token': 't'}, {'tab': '1'}]
+    assert fresh.visited == ['https://example.com', 'https://example.com/home']
+    assert not cache.restore(FakeDriver(), 'other', 'https://example.com')
+
+
+def test_expired_state_falls_back_to_ui_login(tmp_path, monkeypatch):
+    cache = SessionCache(cache_dir=str(tmp_path), ttl=60)
+    cache.capture(FakeDriver([{'name': 'sid', 'value': 'old'}]), 'Admin', 'https://example.com')
+    monkeypatch.setattr(time, 'time', lambda: 10 ** 10)
+
+    driver = FakeDriver()
+    logins = []
+    reused = cache.ensure_logged_in(driver, 'Admin', 'https://example.com',
+                                    ui_login=lambda: logins.append(1), is_logged_in=lambda: True)
+    assert not reused
+    assert logins == [1]
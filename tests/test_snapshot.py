@@ -0,0 +1,77 @@
+import json
+import shutil
+import subprocess
+import pytest
+from selenium.webdriver.common.by import By
+from utils.helpers import SeleniumUtils
+from utils.scripts import IS_DISPLAYED_ATOM, SNAPSHOT_JS, VISIBLE_TEXT_JS
+
+
+class FakeElement:
+    def __init__(self):
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+
+
+class FakeDriver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.result
+
+
+def state(text='', selected=False, value=None, element=None):
+    return {'element': element, 'text': text, 'value': value, 'selected': selected, 'displayed': True,
+            'attributes': {'value': value}}
+
+
+def test_snapshot_reads_all_locators_in_one_call():
+    driver = FakeDriver([state(text='Dashboard'), None])
+    utils = SeleniumUtils(driver)
+    states = utils.snapshot([(By.ID, 'title'), (By.ID, 'missing')])
+
+    assert len(driver.calls) == 1
+    assert driver.calls[0][0] == [[['id', 'title']], [['id', 'missing']]]
+    assert states[(By.ID, 'title')]['text'] == 'Dashboard'
+    assert states[(By.ID, 'missing')] is None
+
+
+def test_select_multiple_checkboxes_clicks_only_unselected_matches():
+    boxes = [FakeElement(), FakeElement(), FakeElement()]
+    driver = FakeDriver([state(value='a', element=boxes[0]), state(value='b', selected=True, element=boxes[1]),
+                         state(value='c', element=boxes[2])])
+    SeleniumUtils(driver).select_multiple_checkboxes((By.NAME, 'langs'), ['a', 'b'])
+
+    assert [box.clicks for box in boxes] == [1, 0, 0]
+    assert driver.calls[0][1] is True
+
+
+def test_assert_element_text_uses_single_read():
+    driver = FakeDriver([state(text='Admin')])
+    SeleniumUtils(driver).assert_element_text((By.ID, 'user'), 'Admin')
+    assert len(driver.calls) == 1
+
+
+def test_assert_elements_text_accepts_locator_chains():
+    chain = ((By.ID, 'user'),)
+    fallback = ((By.ID, 'name'), (By.CSS_SELECTOR, '.name'))
+    driver = FakeDriver([state(text='Admin'), state(text='Paul')])
+    SeleniumUtils(driver).assert_elements_text({chain: 'Admin', fallback: 'Paul'})
+    assert driver.calls[0][0] == [[['id', 'user']], [['id', 'name'], ['css selector', '.name']]]
+
+
+def test_displayed_uses_the_webdriver_is_displayed_atom():
+    assert "var isShown = " + IS_DISPLAYED_ATOM in SNAPSHOT_JS
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node to run the script")
+def test_text_follows_webelement_text_for_hidden_and_spaced_elements():
+    cases = [({'innerText': ' Hello\u00a0World \n  Admin  \n'}, True), ({'innerText': 'Hidden'}, False)]
+    script = VISIBLE_TEXT_JS + "console.log(JSON.stringify(%s.map(function (c) { return visibleText(c[0], c[1]); })));"
+    output = subprocess.run(['node', '-e', script % json.dumps(cases)], capture_output=True, text=True, check=True)
+    assert json.loads(output.stdout) == ['Hello World\nAdmin', '']
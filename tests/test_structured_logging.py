@@ -0,0 +1,75 @@
+import json
+import queue
+import logging
+import pytest
+from logging.handlers import QueueListener
+from utils.structured_logging import ContextQueueHandler, JsonLinesFormatter, configure_logging, log_context, timed
+from utils.helpers import SeleniumUtils
+from utils.actors import Actor, Scenario
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+def capture(name):
+    """Attach a queue handler to one logger and collect the JSON lines it produces."""
+    log_queue, lines = queue.SimpleQueue(), []
+    handler = logging.Handler()
+    handler.setFormatter(JsonLinesFormatter())
+    handler.emit = lambda record: lines.append(json.loads(handler.format(record)))
+    listener = QueueListener(log_queue, handler)
+    logger = logging.getLogger(name)
+    logger.addHandler(ContextQueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    listener.start()
+    return logger, listener, lines
+
+
+def test_records_carry_test_actor_and_timing():
+    logger, listener, lines = capture('tests.structured')
+    with log_context(test='tests/test_x.py::test_y'):
+        with log_context(actor='approver'):
+            logger.info("approved %s", 'PR-1')
+        with timed(logger, "filled %s", 'form'):
+            pass
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logger.exception("step failed")
+    logger.info("outside")
+    listener.stop()
+
+    approved, filled, failed, outside = lines
+    assert approved['message'] == 'approved PR-1'
+    assert (approved['test'], approved['actor'], approved['worker']) == ('tests/test_x.py::test_y', 'approver', 'main')
+    assert filled['actor'] == '' and filled['duration_ms'] >= 0
+    assert 'ValueError: boom' in failed['exc']
+    assert outside['test'].endswith('::test_records_carry_test_actor_and_timing')  # Set by the pytest plugin
+
+
+def test_scenario_steps_log_with_actor_and_callers_test_id():
+    logger, listener, lines = capture('tests.actors')
+    scenario = Scenario([Actor('alice', FakeDriver()), Actor('bob', FakeDriver())])
+    with log_context(test='tests/test_flow.py::test_review'):
+        scenario.run({'alice': lambda actor: logger.info("hi"), 'bob': lambda actor: logger.info("hi")})
+    scenario.close()
+    listener.stop()
+    assert sorted((line['actor'], line['test']) for line in lines) == [
+        ('alice', 'tests/test_flow.py::test_review'), ('bob', 'tests/test_flow.py::test_review')]
+
+
+def test_setup_logger_does_not_add_handlers_per_call():
+    root_handlers = list(logging.getLogger().handlers)
+    for _ in range(3):
+        logger = SeleniumUtils(FakeDriver()).setup_logger('tests.legacy')
+    assert logger.handlers == []
+    assert logging.getLogger().handlers == root_handlers
+
+
+def test_setup_logger_warns_when_log_file_is_ignored():
+    configure_logging()
+    with pytest.warns(DeprecationWarning, match="ignores log_file='unused.log'"):
+        SeleniumUtils(FakeDriver()).setup_logger('tests.legacy', 'unused.log')
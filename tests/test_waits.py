@@ -0,0 +1,29 @@
+from utils.helpers import SeleniumUtils
+
+
+class FakeDriver:
+    def __init__(self, states):
+        self.states = list(states)
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append(cmd)
+
+    def execute_script(self, script, *args):
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+def test_adaptive_wait_returns_once_page_is_stable():
+    driver = FakeDriver([['loading', 0, 0, 0], ['complete', 1, 500, 0], ['complete', 0, 500, 0]])
+    utils = SeleniumUtils(driver, adaptive_wait=True)
+    utils.readiness.poll_interval = 0
+
+    assert utils.wait_until_stable(timeout=5)
+    assert driver.states == [['complete', 0, 500, 0]]
+    assert driver.cdp_commands == ['Page.addScriptToEvaluateOnNewDocument']
+
+
+def test_adaptive_wait_is_capped_at_requested_seconds():
+    driver = FakeDriver([['complete', 0, 0, 2]])
+    utils = SeleniumUtils(driver, adaptive_wait=True)
+    assert not utils.wait_until_stable(timeout=0.1)
@@ -0,0 +1,235 @@
+import os
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from config.driver_setup import create_driver, load_config
+from utils.form_handler import FormHandler
+from utils.helpers import SeleniumUtils
+from utils.session_cache import SessionCache
+from utils.structured_logging import log_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Longest an actor waits in Scenario.sync() for the others before the run is failed.
+SYNC_TIMEOUT = 60
+
+
+def expand_users(users: dict) -> dict:
+    """Expand `count: N` user entries into N actors named <name>1..<name>N.
+
+    "{n}" in the string settings of such an entry is replaced with the actor number.
+    """
+    expanded = {}
+    for name, settings in (users or {}).items():
+        settings = dict(settings)
+        count = settings.pop('count', None)
+        if count is None:
+            expanded[name] = settings
+            continue
+        for n in range(1, int(count) + 1):
+            expanded[f"{name}{n}"] = {key: value.replace('{n}', str(n)) if isinstance(value, str) else value
+                                      for key, value in settings.items()}
+    return expanded
+
+
+class SyncPoint:
+    """A barrier for the steps of one Scenario.run().
+
+    Unlike threading.Barrier it breaks as soon as a step finishes while others wait (or
+    later try to wait) for it, since that step can never arrive.
+    """
+
+    def __init__(self, parties: int, timeout: float = SYNC_TIMEOUT):
+        self.parties = parties
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._generation = 0
+        self._left = 0
+        self.broken = False
+
+    def wait(self, timeout: float = None):
+        with self._cond:
+            if self.broken or self._left:
+                self._break()
+                raise threading.BrokenBarrierError
+            generation = self._generation
+            self._waiting += 1
+            if self._waiting == self.parties:
+                self._waiting = 0
+                self._generation += 1
+                self._cond.notify_all()
+                return
+            released = self._cond.wait_for(lambda: generation != self._generation or self.broken,
+                                           self.timeout if timeout is None else timeout)
+            if generation != self._generation:
+                return
+            if not released:
+                self._break()
+            raise threading.BrokenBarrierError
+
+    def leave(self):
+        """Called when a step finishes; actors still waiting for it are released with an error."""
+        with self._cond:
+            self._left += 1
+            if self._waiting:
+                self._break()
+
+    def abort(self):
+        with self._cond:
+            self._break()
+
+    def _break(self):
+        self.broken = True
+        self._cond.notify_all()
+
+
+class Actor:
+    """One user in a scenario, with its own browser."""
+
+    def __init__(self, name: str, driver, settings: dict = None):
+        self.name = name
+        self.driver = driver
+        self.settings = settings or {}
+        self.utils = SeleniumUtils(driver)
+        self.forms = FormHandler(driver)
+
+    def login(self, session_cache: SessionCache = None):
+        """Log in with the credentials from config, reusing cached session state when possible."""
+        settings = self.settings
+        cache = session_cache or SessionCache()
+
+        def ui_login():
+            self.utils.open_url(settings['login_url'])
+            self.forms.fill_form(os.path.join(ROOT, settings['login_form']),
+                                 {'username': settings['username'], 'password': settings['password']})
+            self.utils.click_element(tuple(settings['submit']))
+
+        def is_logged_in():
+            return self.utils.is_element_visible(tuple(settings['logged_in']))
+
+        return cache.ensure_logged_in(self.driver, settings['username'], settings['base_url'], ui_login,
+                                      is_logged_in, landing_url=settings.get('landing_url'))
+
+    def wait_until(self, condition, timeout: float = 10, poll_interval: float = 0.1):
+        """Wait until condition(actor) is truthy and return its value."""
+        deadline = time.monotonic() + timeout
+        while True:
+            result = condition(self)
+            if result:
+                return result
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{self.name}: condition not met within {timeout}s")
+            time.sleep(poll_interval)
+
+    def __repr__(self):
+        return f"Actor({self.name!r})"
+
+
+class Scenario:
+    """Drives several actors concurrently, with explicit synchronisation points.
+
+        scenario.run({
+            'author': lambda a: (submit_request(a), scenario.sync()),
+            'approver': lambda a: (scenario.sync(), approve(a)),
+        })
+    """
+
+    def __init__(self, actors):
+        self.actors = {actor.name: actor for actor in actors}
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.actors), 1), thread_name_prefix='actor')
+        self._sync_point = None
+
+    @classmethod
+    def from_config(cls, names=None, login: bool = True, session_cache: SessionCache = None):
+        """Create actors for the users in config.yaml (all, or the given names), launching browsers in parallel."""
+        users = expand_users(load_config().get('users'))
+        names = list(names or users)
+        missing = [name for name in names if name not in users]
+        if missing:
+            raise ValueError(f"Unknown users: {', '.join(missing)}. Available: {', '.join(sorted(users))}")
+
+        def start(name):
+            return Actor(name, create_driver(users[name].get('profile')), users[name])
+
+        with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+            futures = [executor.submit(start, name) for name in names]
+        actors, errors = [], []
+        for future in futures:
+            try:
+                actors.append(future.result())
+            except Exception as e:
+                errors.append(e)
+        scenario = cls(actors)
+        if errors:
+            scenario.close()
+            raise errors[0]
+        if login:
+            cache = session_cache or SessionCache()
+            scenario.run({name: lambda actor: actor.login(cache) for name in names})
+        return scenario
+
+    def __getitem__(self, name):
+        return self.actors[name]
+
+    def run(self, steps: dict, timeout: float = None):
+        """Run steps[name](actor) for each named actor at the same time; returns {name: result}.
+
+        If a step fails, finishes while others wait for it in sync(), or the run exceeds
+        timeout, waiting actors are released with BrokenBarrierError and the root cause is
+        raised once every step has stopped.
+        """
+        sync_point = self._sync_point = SyncPoint(len(steps))
+
+        def call(name, step):
+            with log_context(actor=name):
+                try:
+                    return step(self.actors[name])
+                except BaseException:
+                    sync_point.abort()
+                    raise
+                finally:
+                    sync_point.leave()
+
+        # Each step runs in a copy of the caller's context so its log records keep the test id
+        futures = {name: self._executor.submit(contextvars.copy_context().run, call, name, step)
+                   for name, step in steps.items()}
+        _, running = wait(futures.values(), timeout)
+        if running:
+            sync_point.abort()
+            late = [name for name, future in futures.items() if future in running]
+            raise TimeoutError(f"Actors still running after {timeout}s: {', '.join(late)}")
+        results, errors = {}, []
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except threading.BrokenBarrierError as e:
+                errors.append((1, name, e))  # Knock-on failure of another actor's error
+            except Exception as e:
+                errors.append((0, name, e))
+        if errors:
+            _, name, error = min(errors, key=lambda item: item[0])
+            raise RuntimeError(f"Actor '{name}' failed: {error!r}") from error
+        return results
+
+    def sync(self, timeout: float = None):
+        """Block until every actor in the current run() reaches this point (at most SYNC_TIMEOUT by default)."""
+        if self._sync_point is None:
+            raise RuntimeError("sync() can only be called from a step inside run()")
+        self._sync_point.wait(timeout)
+
+    def wait_for(self, name: str, condition, timeout: float = 10):
+        """Wait until actor `name` sees condition(actor), e.g. a notification sent by another actor."""
+        return self.actors[name].wait_until(condition, timeout)
+
+    def close(self):
+        """Quit every actor's browser."""
+        if self._sync_point is not None:
+            self._sync_point.abort()  # Release steps of a run that timed out
+        self._executor.shutdown(wait=True)
+        for actor in self.actors.values():
+            try:
+                actor.driver.quit()
+            except Exception:
+                pass
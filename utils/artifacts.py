@@ -0,0 +1,130 @@
+import os
+import gzip
+import json
+import base64
+import hashlib
+import logging
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, wait
+from selenium.common.exceptions import WebDriverException
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it screenshots are written unscaled
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactPipeline:
+    """Writes screenshots, page sources and browser logs on background threads.
+
+    Only fetching the data from the browser happens on the calling thread. Decoding,
+    de-duplication, optional downscaling and compressed writing run on a thread pool;
+    callers block only while more than max_pending_bytes are queued.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending_bytes: int = 64 * 1024 * 1024,
+                 dedupe: bool = True, max_width: int = None):
+        self.max_pending_bytes = max_pending_bytes
+        self.dedupe = dedupe
+        self.max_width = max_width
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='artifacts')
+        self._pending_bytes = 0
+        self._budget = threading.Condition()
+        self._outstanding = set()
+        self._failures = 0
+        self._digests = {}
+        self._digest_lock = threading.Lock()
+
+    def capture_screenshot(self, driver, file_path: str):
+        """Grab a screenshot and queue it to be written to file_path (PNG).
+
+        Returns the path the frame is written to: with dedupe, a frame identical to an
+        earlier one is not written again and the earlier file's path is returned.
+        """
+        data = driver.get_screenshot_as_base64()
+        if self.dedupe:
+            digest = hashlib.sha1(data.encode('ascii')).hexdigest()
+            with self._digest_lock:
+                previous = self._digests.setdefault(digest, file_path)
+            if previous != file_path:
+                return previous
+        self._submit(self._write_screenshot, len(data), data, file_path)
+        return file_path
+
+    def capture_page_source(self, driver, file_path: str):
+        """Grab the page source and queue it to be written gzip-compressed to file_path + '.gz'."""
+        source = driver.page_source
+        self._submit(self._write_text, len(source), source, file_path + '.gz')
+        return file_path + '.gz'
+
+    def capture_browser_logs(self, driver, file_path: str):
+        """Grab the browser console log (Chromium only) and queue it as gzip-compressed JSON."""
+        try:
+            entries = driver.get_log('browser')
+        except (AttributeError, WebDriverException):
+            return None
+        text = json.dumps(entries)
+        self._submit(self._write_text, len(text), text, file_path + '.gz')
+        return file_path + '.gz'
+
+    def flush(self):
+        """Wait for every queued artifact to be written. Returns the number of failures."""
+        with self._budget:
+            outstanding = list(self._outstanding)
+        wait(outstanding)
+        with self._budget:
+            failures, self._failures = self._failures, 0
+        return failures
+
+    def close(self):
+        """Flush outstanding work and stop the worker threads."""
+        failures = self.flush()
+        self._executor.shutdown(wait=True)
+        return failures
+
+    def _submit(self, func, size, *args):
+        with self._budget:
+            # Always admit at least one item so a single huge artifact cannot deadlock
+            while self._pending_bytes and self._pending_bytes + size > self.max_pending_bytes:
+                self._budget.wait()
+            self._pending_bytes += size
+            future = self._executor.submit(func, *args)
+            self._outstanding.add(future)
+        future.add_done_callback(lambda done: self._release(done, size))
+
+    def _release(self, future, size):
+        if future.exception() is not None:
+            logger.error("Failed to write artifact", exc_info=future.exception())
+        with self._budget:
+            if future.exception() is not None:
+                self._failures += 1
+            self._outstanding.discard(future)
+            self._pending_bytes -= size
+            self._budget.notify_all()
+
+    def _write_screenshot(self, data, file_path):
+        png = base64.b64decode(data)
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if Image is not None and self.max_width:
+            image = Image.open(BytesIO(png))
+            if image.width > self.max_width:
+                image = image.resize((self.max_width, round(image.height * self.max_width / image.width)))
+            image.save(file_path, format='PNG', optimize=True)
+        else:
+            with open(file_path, 'wb') as file:
+                file.write(png)
+        return file_path
+
+    @staticmethod
+    def _write_text(text, file_path):
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(file_path, 'wt', encoding='utf-8', compresslevel=6) as file:
+            file.write(text)
+        return file_path
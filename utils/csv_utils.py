@@ -1,4 +1,5 @@
 import csv
+import gzip
 
 class CSVUtils:
     @staticmethod
@@ -8,4 +9,11 @@ class CSVUtils:
             reader = csv.DictReader(file)
             for row in reader:
                 data.append(row)
-        return data
\ No newline at end of file
+        return data
+
+    @staticmethod
+    def iter_csv(file_path):
+        """Yield rows one at a time instead of building a list; reads .gz files too."""
+        opener = gzip.open if file_path.endswith('.gz') else open
+        with opener(file_path, mode='rt', newline='', encoding='utf-8') as file:
+            yield from csv.DictReader(file)
@@ -0,0 +1,197 @@
+import os
+import csv
+import gzip
+import shutil
+import hashlib
+import tempfile
+import threading
+from array import array
+
+DEFAULT_INDEX_DIR = os.environ.get(
+    'CSV_INDEX_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'csv_index'))
+
+
+def open_binary(path):
+    """Open a CSV file for binary reading, transparently decompressing .gz files."""
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def iter_records(file):
+    """Yield (offset, raw bytes) for each CSV record, keeping quoted newlines inside one record."""
+    offset = file.tell()
+    record = b''
+    for line in file:
+        record += line
+        if record.count(b'"') % 2 == 0:
+            yield offset, record
+            offset += len(record)
+            record = b''
+    if record:
+        yield offset, record
+
+
+def parse_record(raw):
+    """Parse one raw CSV record into a tuple of values."""
+    return tuple(next(csv.reader([raw.decode('utf-8-sig')]), []))
+
+
+class Row:
+    """A CSV row: a tuple of values sharing its data source's header. Behaves like a read-only dict."""
+    __slots__ = ('header', 'values')
+
+    def __init__(self, header, values):
+        self.header = header
+        self.values = values
+
+    def get(self, key, default=None):
+        index = self.header.index_of.get(key)
+        if index is None or index >= len(self.values):
+            return default
+        return self.values[index]
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.header.index_of
+
+    def keys(self):
+        return iter(self.header.names)
+
+    def items(self):
+        return zip(self.header.names, self.values)
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Row({self.to_dict()!r})"
+
+
+class Header:
+    """Column names of a data source with a name -> position lookup."""
+    __slots__ = ('names', 'index_of')
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.index_of = {name: index for index, name in enumerate(self.names)}
+
+
+class CSVDataSource:
+    """Streams rows of a (optionally gzipped) CSV file without loading it into memory.
+
+    A byte-offset index of the rows is cached on disk, so tests can be parametrized by
+    row number and each worker only reads the rows it runs. A gzipped file is decompressed
+    once into a temporary file on the first row() call, since seeking backwards in a gzip
+    stream restarts decompression. Use it as a context manager, or call close(), to release
+    the file row() keeps open.
+    """
+
+    def __init__(self, path: str, index_dir: str = DEFAULT_INDEX_DIR):
+        self.path = os.path.abspath(path)
+        self.index_dir = index_dir
+        self._offsets = None
+        self._file = None
+        self._lock = threading.Lock()
+        with open_binary(self.path) as file:
+            self.header = Header(parse_record(next(iter_records(file), (0, b''))[1]))
+
+    def __iter__(self):
+        """Yield every row in file order."""
+        with open_binary(self.path) as file:
+            records = iter_records(file)
+            next(records, None)  # Skip the header
+            for _, raw in records:
+                values = parse_record(raw)
+                if values:
+                    yield Row(self.header, values)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def row_ids(self):
+        """Row numbers to parametrize tests with."""
+        return range(len(self))
+
+    def row(self, number: int) -> Row:
+        """Read a single row by number, seeking directly to it."""
+        offset = self.offsets[number]
+        with self._lock:
+            if self._file is None:
+                self._file = self._open_seekable()
+            self._file.seek(offset)
+            _, raw = next(iter_records(self._file))
+        return Row(self.header, parse_record(raw))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open_seekable(self):
+        if not self.path.endswith('.gz'):
+            return open(self.path, 'rb')
+        # Offsets are positions in the decompressed data, so they apply to the copy as well
+        file = tempfile.TemporaryFile()
+        with open_binary(self.path) as source:
+            shutil.copyfileobj(source, file, 1024 * 1024)
+        return file
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = self._load_index() or self._build_index()
+        return self._offsets
+
+    def _index_file(self):
+        digest = hashlib.sha1(self.path.encode('utf-8')).hexdigest()
+        return os.path.join(self.index_dir, f"{digest}.idx")
+
+    def _stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_index(self):
+        # Index file layout: mtime_ns, size, then one offset per row
+        if not self.index_dir:
+            return None
+        offsets = array('q')
+        try:
+            with open(self._index_file(), 'rb') as file:
+                offsets.frombytes(file.read())
+        except OSError:
+            return None
+        if len(offsets) < 2 or tuple(offsets[:2]) != self._stamp():
+            return None
+        return offsets[2:]
+
+    def _build_index(self):
+        offsets = array('q')
+        with open_binary(self.path) as file:
+            records = iter_records(file)
+            next(records, None)
+            for offset, raw in records:
+                if raw.strip():
+                    offsets.append(offset)
+        if self.index_dir:
+            try:
+                os.makedirs(self.index_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(array('q', self._stamp()).tobytes())
+                    file.write(offsets.tobytes())
+                os.replace(tmp_path, self._index_file())
+            except OSError:
+                pass
+        return offsets
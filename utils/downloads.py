@@ -0,0 +1,193 @@
+import os
+import time
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, unquote
+import urllib3
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # Listed in requirements.txt; without it DownloadWatcher falls back to polling
+    Observer = None
+    FileSystemEventHandler = object
+
+# Suffixes browsers use for files that are still being written
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.tmp', '.download')
+
+
+def domain_matches(host, domain):
+    """RFC 6265 domain match for a cookie as returned by WebDriver get_cookies().
+
+    A domain with a leading dot came from a Domain attribute and also matches subdomains;
+    without one the cookie is host-only and matches that host exactly.
+    """
+    host, domain = host.lower(), domain.lower()
+    if not domain.startswith('.'):
+        return host == domain
+    return host == domain[1:] or host.endswith(domain)
+
+
+def path_matches(path, cookie_path):
+    """RFC 6265 path match: the cookie's path itself or a path below it."""
+    if path == cookie_path:
+        return True
+    return path.startswith(cookie_path) and (cookie_path.endswith('/') or path[len(cookie_path)] == '/')
+
+
+class Downloader:
+    """Downloads files directly over HTTP using the browser's cookies and user agent.
+
+    Files are streamed to disk in chunks (constant memory), interrupted downloads resume
+    from their .part file with a Range request, and download_many runs several at once.
+    """
+
+    def __init__(self, driver=None, max_workers: int = 4, chunk_size: int = 1024 * 1024, timeout: float = 300):
+        self.driver = driver
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.http = urllib3.PoolManager(maxsize=max_workers, timeout=urllib3.Timeout(connect=30, read=timeout))
+        self._user_agent = None
+
+    def headers_for(self, url):
+        """Request headers carrying the browser session: matching cookies and the user agent."""
+        headers = {}
+        if self.driver is None:
+            return headers
+        if self._user_agent is None:
+            self._user_agent = self.driver.execute_script("return navigator.userAgent;")
+        headers['User-Agent'] = self._user_agent
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        path = parts.path or '/'
+        cookies = [
+            f"{cookie['name']}={cookie['value']}" for cookie in self.driver.get_cookies()
+            if domain_matches(host, cookie.get('domain') or host)
+            and path_matches(path, cookie.get('path') or '/')
+            and (parts.scheme == 'https' or not cookie.get('secure'))
+        ]
+        if cookies:
+            headers['Cookie'] = '; '.join(cookies)
+        return headers
+
+    def download(self, url: str, destination: str, resume: bool = True):
+        """Download url to destination (a file path, or a directory to keep the URL's file name)."""
+        path = destination
+        if os.path.isdir(destination):
+            path = os.path.join(destination, unquote(os.path.basename(urlsplit(url).path)) or 'download')
+        partial = path + '.part'
+        offset = os.path.getsize(partial) if resume and os.path.exists(partial) else 0
+
+        headers = self.headers_for(url)
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+        response = self.http.request('GET', url, headers=headers, preload_content=False)
+        try:
+            if response.status == 416 and offset:
+                pass  # The .part file already holds the whole file
+            elif response.status == 206 and offset:
+                self._write(response, partial, 'ab')
+            elif response.status == 200:
+                self._write(response, partial, 'wb')
+            else:
+                raise RuntimeError(f"Download failed with HTTP {response.status}: {url}")
+        finally:
+            response.release_conn()
+        os.replace(partial, path)
+        return path
+
+    def download_many(self, urls, destination: str, resume: bool = True):
+        """Download several files in parallel, at most max_workers at a time. Returns paths in order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.download, url, destination, resume) for url in urls]
+        return [future.result() for future in futures]
+
+    def _write(self, response, path, mode):
+        with open(path, mode) as file:
+            for chunk in response.stream(self.chunk_size):
+                file.write(chunk)
+
+
+class _CompletionHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self.watcher._check(event.src_path)
+
+    def on_moved(self, event):
+        self.watcher._check(event.dest_path)
+
+
+_downloaders = weakref.WeakKeyDictionary()
+_downloaders_lock = threading.Lock()
+
+
+def downloader_for(driver):
+    """The Downloader shared by everything using driver, so its HTTP connections are reused.
+
+    The Downloader only holds a weak proxy to driver, so both are freed with the driver.
+    """
+    with _downloaders_lock:
+        downloader = _downloaders.get(driver)
+        if downloader is None:
+            downloader = _downloaders[driver] = Downloader(weakref.proxy(driver))
+        return downloader
+
+
+class DownloadWatcher:
+    """Waits for the browser to finish a download into directory.
+
+    Waits on filesystem events from watchdog (see requirements.txt); only polls the
+    directory if watchdog is missing.
+    Start it before triggering the download:
+
+        with DownloadWatcher(download_dir) as watcher:
+            utils.click_element(export_button)
+            path = watcher.wait(timeout=120)
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.2):
+        self.directory = os.path.abspath(directory)
+        self.poll_interval = poll_interval
+        self._existing = set()
+        self._completed = None
+        self._event = threading.Event()
+        self._observer = None
+
+    def __enter__(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._existing = set(os.listdir(self.directory))
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_CompletionHandler(self), self.directory, recursive=False)
+            self._observer.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def wait(self, timeout: float = 60):
+        """Return the path of the first completed new file, or raise TimeoutError."""
+        deadline = time.monotonic() + timeout
+        while not self._event.is_set():
+            if self._observer is None:
+                for name in os.listdir(self.directory):
+                    self._check(os.path.join(self.directory, name))
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No download finished in {self.directory} within {timeout}s")
+            self._event.wait(remaining if self._observer is not None else min(self.poll_interval, remaining))
+        return self._completed
+
+    def _check(self, path):
+        name = os.path.basename(path)
+        if name in self._existing or name.endswith(PARTIAL_SUFFIXES) or not os.path.isfile(path):
+            return
+        if self._completed is None:
+            self._completed = path
+            self._event.set()
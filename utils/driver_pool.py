@@ -0,0 +1,246 @@
+import os
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+from config.driver_setup import create_driver
+
+logger = logging.getLogger(__name__)
+
+
+def worker_shard():
+    """Return (index, count) of the current pytest-xdist worker, or (0, 1) without xdist."""
+    worker = os.environ.get('PYTEST_XDIST_WORKER', '')
+    count = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', '1'))
+    index = int(worker[2:]) if worker.startswith('gw') else 0
+    return index, max(count, 1)
+
+
+def shard_rows(rows, index: int = None, count: int = None):
+    """Return the slice of rows owned by one shard (defaults to the current xdist worker).
+
+    Only use this where a single test iterates rows itself; parametrized rows are already
+    distributed by xdist and collection must be identical on every worker.
+    """
+    if index is None or count is None:
+        index, count = worker_shard()
+    return rows[index::count]
+
+
+def default_pool_size():
+    """Browsers per process: DRIVER_POOL_SIZE, else the cores left to this xdist worker."""
+    configured = os.environ.get('DRIVER_POOL_SIZE')
+    if configured:
+        return max(int(configured), 1)
+    _, workers = worker_shard()
+    return max((os.cpu_count() or 1) // workers, 1)
+
+
+def visited_origins(driver):
+    """http(s) origins in the navigation history of the current tab (Chromium only)."""
+    history = driver.execute_cdp_cmd('Page.getNavigationHistory', {})
+    origins = set()
+    for entry in history.get('entries', ()):
+        parts = urlsplit(entry.get('url', ''))
+        if parts.scheme in ('http', 'https'):
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+    return origins
+
+
+def reset_driver(driver):
+    """Bring a browser back to a clean state: one blank tab, no cookies or storage.
+
+    Chromium browsers are cleared through CDP for every origin any tab visited; other
+    browsers only for the origin of the first tab's page.
+    """
+    handles = driver.window_handles
+    cdp = getattr(driver, 'execute_cdp_cmd', None)
+    origins = set()
+    for handle in reversed(handles):
+        driver.switch_to.window(handle)
+        if cdp is not None:
+            origins |= visited_origins(driver)
+        if handle != handles[0]:
+            driver.close()
+    driver.switch_to.window(handles[0])
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except WebDriverException:
+        pass  # Storage is not available on about:blank or data: URLs
+    if cdp is not None:
+        cdp('Network.clearBrowserCookies', {})
+        for origin in sorted(origins):
+            cdp('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+    else:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+# Seconds between capacity checks while acquire() waits on a full pool
+CAPACITY_CHECK_INTERVAL = 0.5
+
+# Placed on the idle queue when a background launch fails, to wake up a waiting acquire()
+_LAUNCH_FAILED = object()
+
+
+class DriverPool:
+    """A bounded pool of browsers that are leased to tests and reset instead of relaunched.
+
+    Browsers can be launched ahead of time in the background (prewarm), and the pool can
+    keep `spares` idle browsers ready so a lease rarely waits for a cold start.
+    """
+
+    def __init__(self, size: int = None, factory=create_driver, spares: int = 0):
+        self.size = size or default_pool_size()
+        self.factory = factory
+        self.spares = spares
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._warming = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def prewarm(self, count: int = None):
+        """Launch up to count browsers (default: fill the pool) on background threads."""
+        count = self.size if count is None else count
+        started = 0
+        while started < count and self._reserve(warming=True):
+            threading.Thread(target=self._warm, name="driver-prewarm", daemon=True).start()
+            started += 1
+        return started
+
+    def acquire(self, timeout: float = None):
+        """Lease a driver, launching a new one while the pool is below its size."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("DriverPool is closed")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve():
+                    driver = self._launch()
+                else:
+                    # The pool is full: wait for a release or a warm browser, and check again for
+                    # capacity now and then since a discarded browser frees a slot without waking us
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No browser became free within {timeout}s: pool size {self.size}, "
+                                           f"{self.leased()} leased")
+                    try:
+                        driver = self._idle.get(timeout=CAPACITY_CHECK_INTERVAL if remaining is None
+                                                else min(remaining, CAPACITY_CHECK_INTERVAL))
+                    except queue.Empty:
+                        continue
+            if driver is not _LAUNCH_FAILED:
+                self._top_up()
+                return driver
+            if self._closed:
+                self._idle.put(driver)  # Pass the wake-up on to the next waiting acquire()
+
+    def leased(self):
+        """Number of browsers currently leased out."""
+        with self._lock, self._idle.mutex:
+            idle = sum(1 for driver in self._idle.queue if driver is not _LAUNCH_FAILED)
+            return len([driver for driver in self._drivers if driver is not None]) - idle
+
+    def release(self, driver):
+        """Reset a leased driver and return it to the pool; broken drivers are discarded."""
+        try:
+            reset_driver(driver)
+        except WebDriverException:
+            logger.warning("Discarding driver that failed to reset", exc_info=True)
+            self._discard(driver)
+            return
+        if self._closed:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """Context manager that acquires a driver and releases it on exit."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def map_rows(self, func, rows):
+        """Run func(driver, row) for every row on up to `size` browsers in parallel."""
+        def run(row):
+            with self.lease() as driver:
+                return func(driver, row)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, rows))
+
+    def close(self):
+        """Quit every browser the pool launched."""
+        self._closed = True
+        with self._lock:
+            drivers, self._drivers = [d for d in self._drivers if d is not None], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        self._idle.put(_LAUNCH_FAILED)  # Wake up the acquire() calls still waiting, one after another
+
+    def _reserve(self, warming=False):
+        # Reserve a slot while the browser starts
+        with self._lock:
+            if self._closed or len(self._drivers) >= self.size:
+                return False
+            self._drivers.append(None)
+            if warming:
+                self._warming += 1
+            return True
+
+    def _launch(self):
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._lock:
+                if None in self._drivers:
+                    self._drivers.remove(None)
+            raise
+        with self._lock:
+            if None in self._drivers:
+                self._drivers[self._drivers.index(None)] = driver
+                return driver
+        driver.quit()  # The pool was closed while the browser started
+        raise RuntimeError("DriverPool is closed")
+
+    def _warm(self):
+        try:
+            driver = self._launch()
+        except Exception:
+            logger.warning("Background browser launch failed", exc_info=True)
+            driver = _LAUNCH_FAILED
+        with self._lock:
+            self._warming -= 1
+        self._idle.put(driver)
+
+    def _top_up(self):
+        if not self.spares:
+            return
+        with self._lock:
+            missing = self.spares - self._idle.qsize() - self._warming
+        if missing > 0:
+            self.prewarm(missing)
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
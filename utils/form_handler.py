@@ -1,51 +1,120 @@
-import csv
 from selenium.webdriver.support.ui import Select
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from utils.csv_utils import CSVUtils
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from utils.locator_engine import is_locator_chain, locator_engine
+from utils.form_registry import FIELD_ACTIONS, LOCATOR_COLUMNS, registry
+from utils.scripts import FILL_FORM_JS, RESET_FORM_JS
 
 
 class FormHandler:
-    def __init__(self, driver):
+    def __init__(self, driver, engine=None):
         self.driver = driver
+        self.locator_engine = engine or locator_engine
+        # Dispatch table: FormField.action -> bound handler
+        self._actions = {name: getattr(self, name) for name in set(FIELD_ACTIONS.values())}
+        # (url, definition path) -> DOM fingerprint of the pristine form
+        self._baselines = {}
 
-    def fill_form(self, fields_file, data):
-        fields = CSVUtils.read_csv(fields_file)
-        for field in fields:
-            field_name = field['field_name']
-            field_type = field['field_type']
-            locator = self.get_locator(field)
-            value = data.get(field_name, "").strip()  # Get value and strip any whitespace
+    def fill_form(self, fields_file, data, batched=False):
+        """Fill the form described by fields_file with one row of data.
 
+        With batched=True all fields are applied in a single execute_script call
+        and a per-field report is returned.
+        """
+        definition = registry.get(fields_file)
+        if batched:
+            return self.fill_form_batched(definition, data)
+        for field in definition.fields:
+            locators = self.get_locators(field)
+            value = data.get(field.name, "").strip()  # Get value and strip any whitespace
+
+            if not value or field.action is None:
+                continue  # Skip fields with empty values or no action for their type
+
+            self._actions[field.action](locators, value)
+
+    def fill_form_batched(self, definition, data):
+        """Fill all fields in one round trip and return a list of per-field results.
+
+        Fields the script could not find (e.g. rendered late) are retried through the
+        regular per-field path with an explicit wait.
+        """
+        entries = []
+        fields = []
+        for field in definition.fields:
+            locators = self.get_locators(field)
+            value = data.get(field.name, "").strip()
             if not value:
-                continue  # Skip fields with empty values
-
-            if field_type == 'text' or field_type == 'password' or field_type == 'email' or field_type == 'tel' or field_type == 'url':
-                self.enter_text(locator, value)
-            elif field_type == 'select':
-                self.select_dropdown_by_visible_text(locator, value)
-            elif field_type == 'radio':
-                self.select_radio_button(locator, value)
-            elif field_type == 'checkbox':
-                self.select_checkbox(locator, value)
-            elif field_type == 'date':
-                self.set_date(locator, value)
-            elif field_type == 'range':
-                self.set_range(locator, value)
+                continue
+            entries.append([field.name, field.field_type, [list(locator) for locator in locators], value])
+            fields.append(field)
+
+        if not entries:
+            return []
+
+        results = []
+        outcomes = self.driver.execute_script(FILL_FORM_JS, entries)
+        for field, entry, (field_name, status, message) in zip(fields, entries, outcomes):
+            if status == 'missing':
+                status, message = self._fill_field_fallback(field, entry[3])
+            results.append({'field': field_name, 'type': field.field_type, 'status': status, 'message': message})
+        return results
+
+    def _fill_field_fallback(self, field, value):
+        if field.action is None:
+            return 'skipped', f"unsupported field type: {field.field_type}"
+        try:
+            self._actions[field.action](self.get_locators(field), value)
+        except (TimeoutException, NoSuchElementException) as e:
+            return 'missing', str(e).strip() or 'element not found'
+        return 'filled', ''
+
+    def open_form(self, url, fields_file, ready=None, spa=False):
+        """Bring the form at url to its pristine state for the next data row.
+
+        Resets the fields in place when the browser is still on the form, and falls back
+        to loading url when the reset cannot be verified against the baseline fingerprint.
+        ready() is called after a load, before the baseline is recorded. Returns True when
+        the form was reset in place.
+        """
+        if self.reset_form(url, fields_file, spa):
+            return True
+        self.driver.get(url)
+        if ready is not None:
+            ready()
+        self.capture_baseline(url, fields_file)
+        return False
+
+    def reset_form(self, url, fields_file, spa=False):
+        """Restore the form's fields without navigating; True if the result matches the baseline."""
+        definition = registry.get(fields_file)
+        baseline = self._baselines.get((url, definition.path))
+        if baseline is None:
+            return False
+        on_page, fingerprint = self.driver.execute_script(RESET_FORM_JS, url, self._form_chains(definition), spa)
+        return on_page and fingerprint == baseline
+
+    def capture_baseline(self, url, fields_file):
+        """Record the current (freshly loaded) state of the form as its baseline."""
+        definition = registry.get(fields_file)
+        on_page, fingerprint = self.driver.execute_script(RESET_FORM_JS, url, self._form_chains(definition), False)
+        self._baselines[(url, definition.path)] = fingerprint if on_page else None
+
+    def _form_chains(self, definition):
+        return [[field.name, [list(locator) for locator in self.get_locators(field)]]
+                for field in definition.fields if field.locators]
+
+    def get_locators(self, field):
+        """Return the field's locators as a fallback chain, fastest known-working first."""
+        if not field.locators:
+            raise ValueError("No valid locator found for field")
+        if len(field.locators) == 1:
+            return field.locators
+        return self.locator_engine.order(field.locators)
 
     def get_locator(self, field):
-        locators = [
-            ('id_locator', By.ID),
-            ('xpath_locator', By.XPATH),
-            ('linktext_locator', By.LINK_TEXT),
-            ('partiallinktext_locator', By.PARTIAL_LINK_TEXT),
-            ('name_locator', By.NAME),
-            ('tagname_locator', By.TAG_NAME),
-            ('classname_locator', By.CLASS_NAME),
-            ('cssselector_locator', By.CSS_SELECTOR)
-        ]
-        for key, by in locators:
+        for key, by in LOCATOR_COLUMNS:
             if field.get(key):
                 return (by, field[key])
         raise ValueError("No valid locator found for field")
@@ -81,4 +150,6 @@ class FormHandler:
         self.driver.execute_script("arguments[0].value = arguments[1]", range_element, value)
 
     def wait_for_element(self, locator, timeout=10):
+        if is_locator_chain(locator):
+            return self.locator_engine.find(self.driver, locator, timeout)
         return WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located(locator))
@@ -0,0 +1,145 @@
+import os
+import pickle
+import hashlib
+import tempfile
+from selenium.webdriver.common.by import By
+from utils.csv_utils import CSVUtils
+
+# Locator columns of a form definition, in the order they are tried.
+LOCATOR_COLUMNS = (
+    ('id_locator', By.ID),
+    ('xpath_locator', By.XPATH),
+    ('linktext_locator', By.LINK_TEXT),
+    ('partiallinktext_locator', By.PARTIAL_LINK_TEXT),
+    ('name_locator', By.NAME),
+    ('tagname_locator', By.TAG_NAME),
+    ('classname_locator', By.CLASS_NAME),
+    ('cssselector_locator', By.CSS_SELECTOR),
+)
+
+# field_type -> FormHandler method that applies a value to the field.
+FIELD_ACTIONS = {
+    'text': 'enter_text',
+    'password': 'enter_text',
+    'email': 'enter_text',
+    'tel': 'enter_text',
+    'url': 'enter_text',
+    'select': 'select_dropdown_by_visible_text',
+    'radio': 'select_radio_button',
+    'checkbox': 'select_checkbox',
+    'date': 'set_date',
+    'range': 'set_range',
+}
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FORM_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'forms'))
+
+
+class FormField:
+    __slots__ = ('page', 'name', 'field_type', 'locators', 'action')
+
+    def __init__(self, page, name, field_type, locators, action):
+        self.page = page
+        self.name = name
+        self.field_type = field_type
+        self.locators = locators
+        self.action = action
+
+    @property
+    def locator(self):
+        """Primary (By, value) locator of the field."""
+        if not self.locators:
+            raise ValueError("No valid locator found for field")
+        return self.locators[0]
+
+    def __repr__(self):
+        return f"FormField({self.name!r}, {self.field_type!r})"
+
+
+class FormDefinition:
+    __slots__ = ('path', 'mtime', 'fields')
+
+    def __init__(self, path, mtime, fields):
+        self.path = path
+        self.mtime = mtime
+        self.fields = fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    @classmethod
+    def parse(cls, path):
+        """Parse a form definition CSV into typed field records."""
+        mtime = os.stat(path).st_mtime_ns
+        fields = []
+        for row in CSVUtils.read_csv(path):
+            locators = tuple((by, row[key]) for key, by in LOCATOR_COLUMNS if row.get(key))
+            field_type = row['field_type']
+            fields.append(FormField(row.get('page', ''), row['field_name'], field_type, locators,
+                                    FIELD_ACTIONS.get(field_type)))
+        return cls(path, mtime, tuple(fields))
+
+
+class FormRegistry:
+    """Loads each form definition once, invalidated by file mtime.
+
+    Parsed definitions are also pickled under cache_dir so other sessions and
+    xdist workers can skip parsing.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._definitions = {}
+
+    def get(self, fields_file: str) -> FormDefinition:
+        """Return the parsed definition for fields_file."""
+        path = os.path.abspath(fields_file)
+        mtime = os.stat(path).st_mtime_ns
+        definition = self._definitions.get(path)
+        if definition is None or definition.mtime != mtime:
+            definition = self._load_cached(path, mtime)
+            if definition is None:
+                definition = FormDefinition.parse(path)
+                self._store_cached(definition)
+            self._definitions[path] = definition
+        return definition
+
+    def clear(self):
+        """Forget all in-memory definitions."""
+        self._definitions.clear()
+
+    def _cache_file(self, path):
+        digest = hashlib.sha1(path.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def _load_cached(self, path, mtime):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_file(path), 'rb') as file:
+                version, definition = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+            return None
+        if version != CACHE_VERSION or definition.path != path or definition.mtime != mtime:
+            return None
+        return definition
+
+    def _store_cached(self, definition):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file and rename so concurrent workers never read a partial pickle.
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump((CACHE_VERSION, definition), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._cache_file(definition.path))
+        except OSError:
+            pass
+
+
+registry = FormRegistry()
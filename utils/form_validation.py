@@ -0,0 +1,162 @@
+"""Checks form definitions and their data files against each other without a browser.
+
+    python -m utils.form_validation form_definitions/login_form.csv form_data/login_data.csv
+"""
+import os
+import re
+import sys
+import csv
+import json
+import hashlib
+import tempfile
+from collections import namedtuple
+from utils.data_source import open_binary
+from utils.form_registry import FIELD_ACTIONS, LOCATOR_COLUMNS
+
+VALIDATOR_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FORM_VALIDATION_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'validation'))
+
+REQUIRED_COLUMNS = ('page', 'field_name', 'field_type')
+# Field types that are valid in a definition but have no FormHandler action
+PASSIVE_FIELD_TYPES = ('file',)
+TOGGLE_VALUES = ('checked', 'unchecked')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+Issue = namedtuple('Issue', 'level file line message')
+
+
+def _read_rows(path):
+    """Yield (line number, row) for every record of a CSV file, including the header."""
+    with open_binary(path) as raw:
+        text = (line.decode('utf-8-sig') for line in raw)
+        reader = csv.reader(text)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def validate_definition(definition_file):
+    """Check a form definition on its own. Returns (issues, {field_name: field_type})."""
+    issues = []
+    fields = {}
+    rows = _read_rows(definition_file)
+    _, header = next(rows, (0, []))
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        return [Issue('error', definition_file, 1, f"missing columns: {', '.join(missing)}")], fields
+    locator_columns = [header.index(key) for key, _ in LOCATOR_COLUMNS if key in header]
+    name_column, type_column = header.index('field_name'), header.index('field_type')
+
+    for line, row in rows:
+        if not any(row):
+            continue
+        if len(row) != len(header):
+            issues.append(Issue('error', definition_file, line, f"expected {len(header)} columns, got {len(row)}"))
+            continue
+        name, field_type = row[name_column], row[type_column]
+        if name in fields:
+            issues.append(Issue('error', definition_file, line, f"duplicate field_name '{name}'"))
+        fields[name] = field_type
+        if field_type not in FIELD_ACTIONS and field_type not in PASSIVE_FIELD_TYPES:
+            issues.append(Issue('error', definition_file, line, f"unknown field_type '{field_type}' for '{name}'"))
+        elif field_type in PASSIVE_FIELD_TYPES:
+            issues.append(Issue('warning', definition_file, line, f"field '{name}' of type '{field_type}' is never filled"))
+        if not any(row[index] for index in locator_columns):
+            issues.append(Issue('error', definition_file, line, f"no locator for field '{name}'"))
+    return issues, fields
+
+
+def validate_data(data_file, fields):
+    """Check a data file against the fields of its form definition."""
+    issues = []
+    rows = _read_rows(data_file)
+    _, header = next(rows, (0, []))
+    for column in header:
+        if column not in fields:
+            issues.append(Issue('error', data_file, 1, f"column '{column}' is not defined by the form"))
+    for name in fields:
+        if name not in header:
+            issues.append(Issue('warning', data_file, 1, f"form field '{name}' has no data column"))
+
+    typed = [(index, column, fields.get(column)) for index, column in enumerate(header)]
+    for line, row in rows:
+        if not any(row):
+            continue
+        if len(row) != len(header):
+            issues.append(Issue('error', data_file, line, f"expected {len(header)} columns, got {len(row)}"))
+            continue
+        for index, column, field_type in typed:
+            value = row[index].strip()
+            if not value or field_type is None:
+                continue
+            if field_type in ('radio', 'checkbox') and value not in TOGGLE_VALUES:
+                issues.append(Issue('error', data_file, line, f"'{column}' must be checked or unchecked, got '{value}'"))
+            elif field_type == 'range' and not _is_number(value):
+                issues.append(Issue('error', data_file, line, f"'{column}' must be numeric, got '{value}'"))
+            elif field_type == 'date' and not DATE_PATTERN.match(value):
+                issues.append(Issue('error', data_file, line, f"'{column}' must be YYYY-MM-DD, got '{value}'"))
+    return issues
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _file_digest(path, digest):
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+
+def validate(definition_file, data_file=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Validate a definition and optionally its data file; results are cached by file content hash."""
+    digest = hashlib.sha1(f"{VALIDATOR_VERSION}|{definition_file}|{data_file}".encode('utf-8'))
+    _file_digest(definition_file, digest)
+    if data_file:
+        _file_digest(data_file, digest)
+    cache_file = os.path.join(cache_dir, digest.hexdigest() + '.json') if cache_dir else None
+    if cache_file:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as file:
+                return [Issue(*issue) for issue in json.load(file)]
+        except (OSError, ValueError, TypeError):
+            pass
+
+    issues, fields = validate_definition(definition_file)
+    if data_file and not any(issue.level == 'error' and issue.line == 1 for issue in issues):
+        issues += validate_data(data_file, fields)
+
+    if cache_file:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump([list(issue) for issue in issues], file)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            pass
+    return issues
+
+
+def format_issues(issues):
+    return "\n".join(f"{issue.file}:{issue.line}: {issue.level}: {issue.message}" for issue in issues)
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if not args or len(args) > 2:
+        print(__doc__.strip())
+        return 2
+    issues = validate(*args)
+    if issues:
+        print(format_issues(issues))
+    return 1 if any(issue.level == 'error' for issue in issues) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
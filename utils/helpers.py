@@ -1,18 +1,30 @@
 import os
 import logging
 import time
+import warnings
 from selenium import webdriver
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from utils.waits import PageReadiness
+from utils.locator_engine import is_locator_chain, locator_engine
+from utils.scripts import SNAPSHOT_JS
+from utils.downloads import downloader_for
+from utils.structured_logging import configure_logging, logging_configured
 
 
 class SeleniumUtils:
 
-    def __init__(self, driver: webdriver):
+    def __init__(self, driver: webdriver, adaptive_wait: bool = None, artifacts=None):
         self.driver = driver
+        self.artifacts = artifacts
+        # When enabled, wait(sec) waits until the page is stable, capped at sec seconds
+        if adaptive_wait is None:
+            adaptive_wait = os.environ.get('SELENIUM_ADAPTIVE_WAIT', '0') == '1'
+        self.adaptive_wait = adaptive_wait
+        self.readiness = PageReadiness(driver)
 
     # Browser Actions
     def refresh_page(self):
@@ -64,7 +76,9 @@ class SeleniumUtils:
         self.driver.get(url)
 
     def find_element(self, locator: tuple, timeout: int = 10):
-        """Find a single element."""
+        """Find a single element. A sequence of locators is tried as a fallback chain."""
+        if is_locator_chain(locator):
+            return locator_engine.find(self.driver, locator, timeout)
         return WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located(locator))
 
     def find_elements(self, locator: tuple, timeout: int = 10):
@@ -92,10 +106,9 @@ class SeleniumUtils:
             radio_button.click()
 
     def select_multiple_checkboxes(self, locator, values):
-        checkboxes = self.driver.find_elements(*locator)
-        for checkbox in checkboxes:
-            if checkbox.get_attribute("value") in values and not checkbox.is_selected():
-                checkbox.click()
+        for checkbox in self.snapshot_all(locator, attributes=("value",)):
+            if checkbox['attributes']['value'] in values and not checkbox['selected']:
+                checkbox['element'].click()
 
     def set_date(self, locator, date):
         date_element = self.driver.find_element(*locator)
@@ -107,15 +120,13 @@ class SeleniumUtils:
         self.driver.execute_script("arguments[0].value = arguments[1]", range_element, value)
 
     def get_text(self, locator: tuple, timeout: int = 10):
-        """Get text from an element."""
-        element = self.find_element(locator, timeout)
-        return element.text
+        """Get the text of an element, as WebElement.text reports it."""
+        return self.read_state(locator, timeout)['text']
 
     def is_element_visible(self, locator: tuple, timeout: int = 10):
         """Check if an element is visible."""
         try:
-            element = self.find_element(locator, timeout)
-            return element.is_displayed()
+            return self.read_state(locator, timeout)['displayed']
         except TimeoutException:
             return False
 
@@ -150,8 +161,11 @@ class SeleniumUtils:
         self.driver.execute_script("arguments[0].scrollIntoView();", element)
 
     def take_screenshot(self, file_path: str):
-        """Take a screenshot of the current window."""
+        """Take a screenshot of the current window, written in the background when an artifact pipeline is set."""
+        if self.artifacts is not None:
+            return self.artifacts.capture_screenshot(self.driver, file_path)
         self.driver.save_screenshot(file_path)
+        return file_path
 
     def switch_to_frame(self, locator: tuple, timeout: int = 10):
         """Switch to a specific frame."""
@@ -186,17 +200,46 @@ class SeleniumUtils:
         element.send_keys(file_path)
 
     def download_file(self, file_url: str, destination_folder: str):
-        """Download a file (assuming direct URL download)."""
-        local_filename = os.path.join(destination_folder, file_url.split('/')[-1])
-        with self.driver.get(file_url) as response:
-            with open(local_filename, 'wb') as file:
-                file.write(response.content)
-        return local_filename
+        """Download a file directly over HTTP with the browser's cookies, streamed to disk."""
+        return downloader_for(self.driver).download(file_url, destination_folder)
 
     def execute_script(self, script: str, *args):
         """Execute a custom JavaScript script."""
         return self.driver.execute_script(script, *args)
 
+    # Bulk State Reads
+    def snapshot(self, locators: list, attributes: tuple = ()):
+        """Read text, value, selected, displayed and attributes of many elements in one call.
+
+        Returns {locator: state}, keyed by the given locators, with None for elements that
+        are not present.
+        """
+        locators = list(locators)
+        chains = [self._as_chain(locator) for locator in locators]
+        states = self.driver.execute_script(SNAPSHOT_JS, chains, False, list(attributes))
+        return dict(zip(locators, states))
+
+    def snapshot_all(self, locator: tuple, attributes: tuple = ()):
+        """Read the state of every element matching locator in one call."""
+        return self.driver.execute_script(SNAPSHOT_JS, [self._as_chain(locator)], True, list(attributes))
+
+    @staticmethod
+    def _as_chain(locator):
+        if is_locator_chain(locator):
+            return [list(item) for item in locator]
+        return [list(locator)]
+
+    def read_state(self, locator: tuple, timeout: int = 10, attributes: tuple = ()):
+        """Wait until locator is present and return its state, one round trip per poll."""
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self.driver.execute_script(SNAPSHOT_JS, [self._as_chain(locator)], False, list(attributes))[0]
+            if state is not None:
+                return state
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"Element not found: {locator}")
+            time.sleep(0.1)
+
     # Waits
     def wait_for_element_visible(self, locator: tuple, timeout: int = 10):
         """Wait for an element to be visible."""
@@ -220,25 +263,38 @@ class SeleniumUtils:
             return None
 
     def wait(self, sec: int):
-        time.sleep(sec)
+        """Sleep for sec seconds, or wait until the page is stable (at most sec) in adaptive mode."""
+        if self.adaptive_wait:
+            self.readiness.wait_until_stable(timeout=sec)
+        else:
+            time.sleep(sec)
+
+    def wait_until_stable(self, timeout: int = 10):
+        """Wait until the page has loaded, network is idle and the DOM is quiet."""
+        return self.readiness.wait_until_stable(timeout=timeout)
 
     # Assertions
     def assert_element_text(self, locator: tuple, expected_text: str, timeout: int = 10):
         """Assert that an element's text matches the expected text."""
-        element = self.find_element(locator, timeout)
-        actual_text = element.text
+        actual_text = self.read_state(locator, timeout)['text']
         assert actual_text == expected_text, f"Expected text: '{expected_text}', but got: '{actual_text}'"
 
     def assert_element_contains_text(self, locator: tuple, expected_text: str, timeout: int = 10):
         """Assert that an element's text contains the expected text."""
-        element = self.find_element(locator, timeout)
-        actual_text = element.text
+        actual_text = self.read_state(locator, timeout)['text']
         assert expected_text in actual_text, f"Expected text to contain: '{expected_text}', but got: '{actual_text}'"
 
     def assert_element_visible(self, locator: tuple, timeout: int = 10):
         """Assert that an element is visible."""
-        element = self.find_element(locator, timeout)
-        assert element.is_displayed(), "Expected element to be visible, but it is not."
+        assert self.read_state(locator, timeout)['displayed'], "Expected element to be visible, but it is not."
+
+    def assert_elements_text(self, expected: dict):
+        """Assert the text of several elements, given as {locator: expected_text}, in one read."""
+        states = self.snapshot(list(expected))
+        for locator, expected_text in expected.items():
+            assert states[locator] is not None, f"Element not found: {locator}"
+            actual_text = states[locator]['text']
+            assert actual_text == expected_text, f"Expected text: '{expected_text}', but got: '{actual_text}'"
 
     # File Operations
     def read_file(self, file_path: str):
@@ -259,13 +315,17 @@ class SeleniumUtils:
             print(f"The file {file_path} does not exist.")
 
     # Logging
-    def setup_logger(self, name: str, log_file: str, level: int = logging.INFO):
-        """Setup a logger."""
-        handler = logging.FileHandler(log_file)
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-
+    def setup_logger(self, name: str, log_file: str = None, level: int = logging.INFO):
+        """Return a logger writing to the process-wide JSON-lines log.
+
+        log_file only applies if logging is not configured yet, which under pytest it always is;
+        passing it then raises a DeprecationWarning.
+        """
+        if log_file is not None and logging_configured():
+            warnings.warn(f"setup_logger() ignores log_file={log_file!r}: logging is already configured and "
+                          f"records go to the process-wide JSON-lines log (see `logging` in config.yaml)",
+                          DeprecationWarning, stacklevel=2)
+        configure_logging(log_file=log_file)
         logger = logging.getLogger(name)
         logger.setLevel(level)
-        logger.addHandler(handler)
-
-        return logger
\ No newline at end of file
+        return logger
@@ -0,0 +1,158 @@
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames from these directories are reported as helpers in the call stack of a command
+HELPER_DIRS = tuple(os.path.join(ROOT, name) + os.sep for name in ('utils', 'pages', 'config'))
+
+_profiler = None
+command_logger = logging.getLogger('webdriver.commands')
+
+
+class CommandRecord:
+    __slots__ = ('command', 'locator', 'duration_ms', 'payload_bytes', 'test', 'stack')
+
+    def __init__(self, command, locator, duration_ms, payload_bytes, test, stack):
+        self.command = command
+        self.locator = locator
+        self.duration_ms = duration_ms
+        self.payload_bytes = payload_bytes
+        self.test = test
+        self.stack = stack
+
+    @property
+    def helper(self):
+        """Innermost repo helper that issued the command."""
+        return self.stack[-1] if self.stack else ''
+
+
+class CommandProfiler:
+    """Records every WebDriver command sent by instrumented drivers."""
+
+    def __init__(self):
+        self.records = []
+        self.current_test = ''
+        self._lock = threading.Lock()
+
+    def instrument(self, driver):
+        """Wrap the driver's command executor so every command is recorded."""
+        executor = driver.command_executor
+        if getattr(executor, '_profiled', False):
+            return driver
+        original = executor.execute
+
+        def execute(command, params):
+            stack = self._helper_stack()
+            start = time.perf_counter()
+            try:
+                response = original(command, params)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+            payload = len(json.dumps(params, default=str)) + len(json.dumps(response, default=str))
+            locator = f"{params['using']}={params['value']}" if params and 'using' in params else ''
+            with self._lock:
+                self.records.append(CommandRecord(command, locator, duration_ms, payload, self.current_test, stack))
+            return response
+
+        executor.execute = execute
+        executor._profiled = True
+        return driver
+
+    @staticmethod
+    def _helper_stack():
+        stack = []
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(HELPER_DIRS) and not filename.endswith('instrumentation.py'):
+                stack.append(getattr(frame.f_code, 'co_qualname', frame.f_code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def summary(self, key='command'):
+        """Aggregate records by 'command', 'helper' or 'test': {name: (count, total_ms, payload_bytes)}."""
+        totals = defaultdict(lambda: [0, 0.0, 0])
+        for record in self.records:
+            entry = totals[getattr(record, key) or '<direct>']
+            entry[0] += 1
+            entry[1] += record.duration_ms
+            entry[2] += record.payload_bytes
+        return {name: tuple(values) for name, values in totals.items()}
+
+    def write_folded(self, directory):
+        """Write one flame-graph compatible folded-stack file per test (values in microseconds)."""
+        per_test = defaultdict(lambda: defaultdict(float))
+        for record in self.records:
+            frames = (record.test or 'session',) + record.stack + (record.command,)
+            per_test[record.test or 'session'][';'.join(frames)] += record.duration_ms * 1000
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        for test, stacks in per_test.items():
+            path = os.path.join(directory, re.sub(r'[^\w.\-]+', '_', test).strip('_') + '.folded')
+            with open(path, 'w', encoding='utf-8') as file:
+                for frames, micros in stacks.items():
+                    file.write(f"{frames} {int(micros)}\n")
+            written.append(path)
+        return written
+
+
+def merge_summaries(summaries):
+    """Add up several summary() results, e.g. from xdist workers."""
+    totals = defaultdict(lambda: [0, 0.0, 0])
+    for summary in summaries:
+        for name, (count, total_ms, payload) in summary.items():
+            entry = totals[name]
+            entry[0] += count
+            entry[1] += total_ms
+            entry[2] += payload
+    return {name: tuple(values) for name, values in totals.items()}
+
+
+def enable():
+    """Turn on command recording for drivers created from now on."""
+    global _profiler
+    if _profiler is None:
+        _profiler = CommandProfiler()
+    return _profiler
+
+
+def get_profiler():
+    """Return the active profiler, or None when profiling is off."""
+    return _profiler
+
+
+def log_commands(driver):
+    """Log every command of driver at DEBUG level with its duration."""
+    executor = driver.command_executor
+    if getattr(executor, '_logged', False):
+        return driver
+    original = executor.execute
+
+    def execute(command, params):
+        start = time.perf_counter()
+        try:
+            return original(command, params)
+        finally:
+            locator = f"{params['using']}={params['value']}" if params and 'using' in params else ''
+            command_logger.debug("%s %s", command, locator,
+                                 extra={'duration_ms': (time.perf_counter() - start) * 1000})
+
+    executor.execute = execute
+    executor._logged = True
+    return driver
+
+
+def instrument_driver(driver):
+    """Instrument driver if profiling or command logging is enabled; otherwise return it untouched at no cost."""
+    if _profiler is not None:
+        _profiler.instrument(driver)
+    if command_logger.isEnabledFor(logging.DEBUG):
+        log_commands(driver)
+    return driver
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves from parallel workers are then not serialised
+    fcntl = None
+
+DEFAULT_STATS_FILE = os.environ.get(
+    'LOCATOR_STATS_FILE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'locator_stats.json'))
+
+
+def is_locator_chain(locator):
+    """True for a sequence of (By, value) tuples rather than a single locator."""
+    return bool(locator) and isinstance(locator[0], (tuple, list))
+
+
+def chain_key(locators):
+    """Stable key identifying a fallback chain across runs."""
+    return "|".join(f"{by}={value}" for by, value in sorted(tuple(locator) for locator in locators))
+
+
+def new_entry():
+    return {'hits': 0, 'misses': 0, 'avg_ms': 0.0, 'last_ok': False, 'unique': True}
+
+
+def merge_entry(target, delta):
+    """Add the counts of delta into target, weighting the average times by hits."""
+    hits = target['hits'] + delta['hits']
+    if hits:
+        target['avg_ms'] = (target['avg_ms'] * target['hits'] + delta['avg_ms'] * delta['hits']) / hits
+    target['hits'] = hits
+    target['misses'] += delta['misses']
+    target['last_ok'] = delta['last_ok']
+    if delta['hits']:
+        target['unique'] = delta['unique']
+
+
+class LocatorEngine:
+    """Resolves elements through a fallback chain of locators, fastest known-working first.
+
+    Per-locator hit/miss counts and average lookup time are kept per chain and persisted
+    to stats_file so the ranking carries over between runs. Only locators that matched
+    exactly one element are promoted, so a fast but ambiguous class or tag locator never
+    overtakes a specific one.
+    """
+
+    def __init__(self, stats_file: str = DEFAULT_STATS_FILE, poll_interval: float = 0.1):
+        self.stats_file = stats_file
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._stats = self._load()
+        # Outcomes recorded since the last save, merged into the file by save()
+        self._delta = {}
+
+    def order(self, locators):
+        """Return locators ranked: working ones by average time, then untried, then ones that last failed."""
+        stats = self._stats.get(chain_key(locators), {})
+
+        def rank(indexed):
+            index, (by, value) = indexed
+            entry = stats.get(f"{by}={value}")
+            if entry is None:
+                return (1, 0, index)
+            if entry['hits'] and entry['last_ok'] and entry.get('unique', True):
+                return (0, entry['avg_ms'], index)
+            return (2, entry['misses'] - entry['hits'], index)
+
+        return [tuple(locator) for _, locator in sorted(enumerate(locators), key=rank)]
+
+    def find(self, driver, locators, timeout: float = 10):
+        """Return the first element matched by any locator in the chain, polling until timeout."""
+        ordered = self.order(locators)
+        key = chain_key(locators)
+        deadline = time.monotonic() + timeout
+        while True:
+            missed = []
+            for locator in ordered:
+                start = time.perf_counter()
+                try:
+                    elements = driver.find_elements(*locator)
+                except WebDriverException:
+                    elements = []  # e.g. an invalid selector for this strategy
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if elements:
+                    self.record(key, locator, True, elapsed_ms, unique=len(elements) == 1)
+                    for failed, failed_ms in missed:
+                        self.record(key, failed, False, failed_ms)
+                    return elements[0]
+                missed.append((locator, elapsed_ms))
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"No locator matched: {ordered}")
+            time.sleep(min(self.poll_interval, remaining))
+
+    def record(self, key, locator, success, elapsed_ms, unique=True):
+        """Record the outcome of one lookup; unique tells whether it matched exactly one element."""
+        by, value = locator
+        with self._lock:
+            for stats in (self._stats, self._delta):
+                entry = stats.setdefault(key, {}).setdefault(f"{by}={value}", new_entry())
+                entry['last_ok'] = success
+                if success:
+                    entry['hits'] += 1
+                    entry['avg_ms'] += (elapsed_ms - entry['avg_ms']) / entry['hits']
+                    entry['unique'] = unique
+                else:
+                    entry['misses'] += 1
+
+    def stats(self, locators):
+        """Return the recorded statistics for a chain, keyed by 'by=value'."""
+        return dict(self._stats.get(chain_key(locators), {}))
+
+    def save(self):
+        """Merge the outcomes recorded since the last save into stats_file.
+
+        The file is re-read under an exclusive lock so parallel workers add up their
+        statistics instead of overwriting each other's.
+        """
+        if not self.stats_file:
+            return
+        with self._lock:
+            delta, self._delta = self._delta, {}
+        if not delta:
+            return
+        directory = os.path.dirname(self.stats_file)
+        os.makedirs(directory, exist_ok=True)
+        with open(self.stats_file + '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = self._load()
+            for key, locators in delta.items():
+                for name, entry in locators.items():
+                    merge_entry(merged.setdefault(key, {}).setdefault(name, new_entry()), entry)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(merged, file)
+            os.replace(tmp_path, self.stats_file)
+        with self._lock:
+            for key, locators in merged.items():
+                self._stats.setdefault(key, {}).update(locators)
+
+    def _load(self):
+        if not self.stats_file:
+            return {}
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+locator_engine = LocatorEngine()
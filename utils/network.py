@@ -0,0 +1,392 @@
+import json
+import time
+import base64
+import socket
+import select
+import fnmatch
+import logging
+import itertools
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import urllib3
+import websocket  # websocket-client, installed with selenium
+
+logger = logging.getLogger(__name__)
+
+# Hop-by-hop headers are never forwarded (RFC 7230 section 6.1)
+HOP_BY_HOP = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection',
+              'te', 'trailers', 'transfer-encoding', 'upgrade'}
+
+# CDP resource types whose responses the asset cache keeps
+STATIC_RESOURCE_TYPES = ('Script', 'Stylesheet', 'Image', 'Font')
+# Response headers that no longer apply once CDP has decoded the body
+DECODED_BODY_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+RESOURCE_TIMING_JS = """
+return performance.getEntriesByType('resource').map(function (entry) {
+    return {url: entry.name, type: entry.initiatorType, duration_ms: entry.duration,
+            transfer_bytes: entry.transferSize, cached: entry.transferSize === 0 && entry.decodedBodySize > 0};
+});
+"""
+
+
+def matches_any(url, patterns):
+    """True if url matches one of the '*' wildcard patterns (same syntax as CDP setBlockedURLs)."""
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+
+def resource_timings(driver):
+    """Per-request timing of the current page from the Resource Timing API."""
+    return driver.execute_script(RESOURCE_TIMING_JS)
+
+
+def block_urls(driver, patterns):
+    """Block requests matching patterns in a Chromium browser via CDP."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+
+
+class LRUCache:
+    """Thread-safe response cache bounded by total body size, evicting least recently used entries."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, status, headers, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[2])
+            self._entries[key] = (status, headers, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CdpSession:
+    """Minimal CDP client on a DevTools websocket that, unlike execute_cdp_cmd, receives events.
+
+    Commands block until their response arrives; event handlers run on a small thread pool
+    so they can send commands themselves.
+    """
+
+    def __init__(self, websocket_url: str, timeout: float = 30):
+        # Chrome rejects DevTools connections that send an Origin header
+        try:
+            self._ws = websocket.create_connection(websocket_url, timeout=timeout, suppress_origin=True)
+        except websocket.WebSocketException as e:
+            raise RuntimeError(f"Cannot connect to {websocket_url}: {e}") from e
+        self._ws.settimeout(None)
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._handlers = {}
+        self._send_lock = threading.Lock()
+        self._events = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cdp-events')
+        self.closed = False
+        threading.Thread(target=self._read, name='cdp-reader', daemon=True).start()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Open a session on the driver's current tab (chromedriver window handles are target ids)."""
+        capabilities = driver.capabilities
+        options = capabilities.get('goog:chromeOptions') or capabilities.get('ms:edgeOptions') or {}
+        address = options.get('debuggerAddress')
+        if not address:
+            raise RuntimeError("The browser does not expose a DevTools address")
+        return cls(f"ws://{address}/devtools/page/{driver.current_window_handle}")
+
+    def on(self, event: str, handler):
+        """Call handler(params) for every `event` the browser sends."""
+        self._handlers[event] = handler
+
+    def send(self, method: str, params: dict = None):
+        """Send a command and return its result; CDP errors raise RuntimeError."""
+        message_id = next(self._ids)
+        future = self._pending[message_id] = Future()
+        try:
+            with self._send_lock:
+                self._ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        except (OSError, websocket.WebSocketException) as e:
+            self._pending.pop(message_id, None)
+            raise RuntimeError(f"CDP connection lost: {e}") from e
+        return future.result(self.timeout)
+
+    def close(self):
+        self.closed = True
+        try:
+            self._ws.close()
+        except (OSError, websocket.WebSocketException):
+            pass
+        self._events.shutdown(wait=False)
+
+    def _read(self):
+        try:
+            while True:
+                message = json.loads(self._ws.recv())
+                if 'id' in message:
+                    future = self._pending.pop(message['id'], None)
+                    if future is None:
+                        continue
+                    if 'error' in message:
+                        future.set_exception(RuntimeError(f"CDP error: {message['error'].get('message')}"))
+                    else:
+                        future.set_result(message.get('result', {}))
+                elif message.get('method') in self._handlers:
+                    self._events.submit(self._handlers[message['method']], message.get('params', {}))
+        except (OSError, ValueError, websocket.WebSocketException):
+            pass  # The browser went away or close() was called
+        finally:
+            self.closed = True
+            for future in list(self._pending.values()):
+                future.set_exception(RuntimeError("CDP connection closed"))
+            self._pending.clear()
+
+
+class AssetCache:
+    """Serves repeated static assets of a Chromium tab from a shared in-memory LRU cache.
+
+    Requests for scripts, stylesheets, images and fonts are paused with CDP Fetch
+    interception: a cached response is fulfilled without touching the network, otherwise
+    the request continues and a cacheable response is stored when it arrives. This works
+    for HTTPS because the browser hands over the decrypted response.
+    """
+
+    def __init__(self, session, cache: LRUCache, resource_types=STATIC_RESOURCE_TYPES):
+        self.session = session
+        self.cache = cache
+        self.counts = {'cache': 0, 'network': 0}
+        self._lock = threading.Lock()
+        session.on('Fetch.requestPaused', self._paused)
+        patterns = [{'urlPattern': '*', 'resourceType': resource_type, 'requestStage': stage}
+                    for resource_type in resource_types for stage in ('Request', 'Response')]
+        session.send('Fetch.enable', {'patterns': patterns})
+
+    def stats(self):
+        """Counts of intercepted requests by source: 'cache' or 'network'."""
+        with self._lock:
+            return dict(self.counts)
+
+    @staticmethod
+    def is_cacheable(method, status, headers):
+        if method != 'GET' or status != 200:
+            return False
+        cache_control = headers.get('cache-control', '').lower()
+        return 'no-store' not in cache_control and 'private' not in cache_control and 'set-cookie' not in headers
+
+    def _count(self, source):
+        with self._lock:
+            self.counts[source] += 1
+
+    def _paused(self, params):
+        request_id = params['requestId']
+        request = params['request']
+        try:
+            if 'responseStatusCode' not in params and 'responseErrorReason' not in params:
+                cached = self.cache.get(request['url']) if request['method'] == 'GET' else None
+                if cached is None:
+                    self.session.send('Fetch.continueRequest', {'requestId': request_id})
+                    return
+                status, headers, body = cached
+                self._count('cache')
+                self.session.send('Fetch.fulfillRequest', {
+                    'requestId': request_id, 'responseCode': status, 'responseHeaders': headers,
+                    'body': base64.b64encode(body).decode('ascii')})
+                return
+            self._count('network')
+            status = params.get('responseStatusCode')
+            headers = params.get('responseHeaders') or []
+            if self.is_cacheable(request['method'], status, {h['name'].lower(): h['value'] for h in headers}):
+                result = self.session.send('Fetch.getResponseBody', {'requestId': request_id})
+                body = (base64.b64decode(result['body']) if result.get('base64Encoded')
+                        else result['body'].encode('utf-8'))
+                kept = [h for h in headers if h['name'].lower() not in DECODED_BODY_HEADERS]
+                self.cache.put(request['url'], status, kept, body)
+            self.session.send('Fetch.continueRequest', {'requestId': request_id})
+        except (RuntimeError, TimeoutError):
+            # The request was cancelled or the tab closed; never leave a request paused
+            logger.debug("Asset cache could not handle %s", request.get('url'), exc_info=True)
+            if not self.session.closed:
+                try:
+                    self.session.send('Fetch.continueRequest', {'requestId': request_id})
+                except (RuntimeError, TimeoutError):
+                    pass
+
+
+class BlockingProxy:
+    """Local HTTP proxy that blocks URL patterns and records the timing of every request.
+
+    Plain HTTP requests are matched against the full URL. HTTPS traffic is tunnelled through
+    CONNECT, so it can only be blocked by host; use block_urls() for path patterns on HTTPS
+    pages. Every request's timing is kept in `requests`.
+    """
+
+    def __init__(self, blocked_urls=(), max_records: int = 10000):
+        self.blocked_urls = tuple(blocked_urls)
+        self.requests = deque(maxlen=max_records)
+        self.http = urllib3.PoolManager(maxsize=16, retries=False)
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, port: int = 0):
+        """Start serving on 127.0.0.1 in a background thread."""
+        handler = type('Handler', (ProxyRequestHandler,), {'proxy': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='blocking-proxy', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def record(self, method, url, status, started, size, source):
+        self.requests.append({'method': method, 'url': url, 'status': status, 'source': source,
+                              'duration_ms': (time.perf_counter() - started) * 1000, 'bytes': size})
+
+    def stats(self):
+        """Counts of requests by source: 'network', 'blocked', 'tunnel'."""
+        counts = {}
+        for request in list(self.requests):
+            counts[request['source']] = counts.get(request['source'], 0) + 1
+        return counts
+
+
+class ProxyRequestHandler(BaseHTTPRequestHandler):
+    proxy = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        started = time.perf_counter()
+        host, _, port = self.path.partition(':')
+        if matches_any(f"https://{host}/", self.proxy.blocked_urls):
+            self.proxy.record('CONNECT', self.path, 403, started, 0, 'blocked')
+            self.send_error(403, 'Blocked')
+            return
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=30)
+        except OSError:
+            self.send_error(502, 'Bad Gateway')
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        sent = self._tunnel(self.connection, upstream)
+        self.proxy.record('CONNECT', self.path, 200, started, sent, 'tunnel')
+        self.close_connection = True
+
+    @staticmethod
+    def _tunnel(client, upstream):
+        sent = 0
+        sockets = [client, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, 60)
+                if errored or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return sent
+                    (upstream if sock is client else client).sendall(data)
+                    sent += len(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+        return sent
+
+    def _forward(self):
+        started = time.perf_counter()
+        url = self.path
+        method = self.command
+        if matches_any(url, self.proxy.blocked_urls):
+            self.proxy.record(method, url, 204, started, 0, 'blocked')
+            self._respond(204, {}, b'')
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP}
+        try:
+            response = self.proxy.http.request(method, url, body=body, headers=headers,
+                                               redirect=False, decode_content=False)
+        except urllib3.exceptions.HTTPError as e:
+            logger.debug("Proxy request failed: %s %s: %s", method, url, e)
+            self.send_error(502, 'Bad Gateway')
+            return
+        response_headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP}
+        self.proxy.record(method, url, response.status, started, len(response.data), 'network')
+        self._respond(response.status, response_headers, response.data)
+
+    def _respond(self, status, headers, body):
+        self.send_response(status)
+        for key, value in headers.items():
+            if key.lower() != 'content-length':
+                self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _forward
+
+
+_proxies = {}
+_proxies_lock = threading.Lock()
+_shared_caches = {}
+_asset_caches = weakref.WeakKeyDictionary()
+_asset_caches_lock = threading.Lock()
+
+
+def get_proxy(blocked_urls=()):
+    """Start one proxy per set of blocked URL patterns on first use and return it."""
+    key = tuple(blocked_urls)
+    with _proxies_lock:
+        if key not in _proxies:
+            _proxies[key] = BlockingProxy(blocked_urls=key).start()
+        return _proxies[key]
+
+
+def enable_asset_cache(driver, cache_mb: int = 256):
+    """Serve repeated static assets of driver's current tab from this process's LRU cache.
+
+    Browsers with the same budget share one cache. Chromium only; returns the AssetCache.
+    """
+    with _asset_caches_lock:
+        if cache_mb not in _shared_caches:
+            _shared_caches[cache_mb] = LRUCache(cache_mb * 1024 * 1024)
+        cache = _shared_caches[cache_mb]
+    asset_cache = AssetCache(CdpSession.for_driver(driver), cache)
+    with _asset_caches_lock:
+        previous, _asset_caches[driver] = _asset_caches.get(driver), asset_cache
+    if previous is not None:
+        previous.session.close()
+    return asset_cache
@@ -0,0 +1,26 @@
+import pytest
+from utils.form_validation import format_issues, validate
+
+invalid_dataset_key = pytest.StashKey[str]()
+
+
+def pytest_collection_modifyitems(session, config, items):
+    # Validate every (definition, data) pair once, before any browser is started
+    results = {}
+    for item in items:
+        marker = item.get_closest_marker("form_dataset")
+        if marker is None:
+            continue
+        pair = tuple(marker.args)
+        if pair not in results:
+            errors = [issue for issue in validate(*pair) if issue.level == 'error']
+            results[pair] = format_issues(errors) if errors else None
+        item.stash[invalid_dataset_key] = results[pair]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # Runs before fixture setup, so no browser is launched for an invalid dataset
+    problems = item.stash.get(invalid_dataset_key, None)
+    if problems:
+        pytest.fail(f"Invalid form dataset:\n{problems}", pytrace=False)
@@ -0,0 +1,17 @@
+import pytest
+from utils.structured_logging import configure_logging, log_context, shutdown_logging
+
+
+def pytest_configure(config):
+    # One queue listener per process, including each xdist worker
+    configure_logging()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    with log_context(test=item.nodeid):
+        yield
+
+
+def pytest_unconfigure(config):
+    shutdown_logging()
@@ -0,0 +1,88 @@
+import os
+import html
+import pytest
+from utils import instrumentation
+
+PROFILE_DIR = os.path.join(instrumentation.ROOT, 'reports', 'profiles')
+SUMMARY_KEYS = ('command', 'helper')
+
+# Summaries sent back by xdist workers, merged on the controller
+_worker_summaries = []
+
+
+def pytest_addoption(parser):
+    parser.addoption("--profile-webdriver", action="store_true", default=False,
+                     help="record every WebDriver command and report where the time goes")
+
+
+def pytest_configure(config):
+    if config.getoption("--profile-webdriver") or os.environ.get('WEBDRIVER_PROFILE') == '1':
+        instrumentation.enable()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    profiler = instrumentation.get_profiler()
+    if profiler is not None:
+        profiler.current_test = item.nodeid
+    yield
+    if profiler is not None:
+        profiler.current_test = ''
+
+
+def collected_summary(key):
+    """Summary by key over this process's records and those of every finished xdist worker."""
+    profiler = instrumentation.get_profiler()
+    summaries = [summary[key] for summary in _worker_summaries]
+    if profiler is not None and profiler.records:
+        summaries.append(profiler.summary(key))
+    return instrumentation.merge_summaries(summaries)
+
+
+def summary_rows(key, limit=15):
+    rows = sorted(collected_summary(key).items(), key=lambda item: item[1][1], reverse=True)
+    return rows[:limit]
+
+
+def pytest_terminal_summary(terminalreporter):
+    if instrumentation.get_profiler() is None or not collected_summary('command'):
+        return
+    for key in SUMMARY_KEYS:
+        terminalreporter.write_sep("-", f"WebDriver time by {key}")
+        terminalreporter.write_line(f"{key:<50}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'bytes':>12}")
+        for name, (count, total_ms, payload) in summary_rows(key):
+            terminalreporter.write_line(f"{name[:50]:<50}{count:>8}{total_ms:>12.1f}{total_ms / count:>10.2f}{payload:>12}")
+    terminalreporter.write_line(f"flame graph input: {PROFILE_DIR}")
+
+
+def pytest_sessionfinish(session):
+    profiler = instrumentation.get_profiler()
+    if profiler is None or not profiler.records:
+        return
+    directory = PROFILE_DIR
+    workerinput = getattr(session.config, 'workerinput', None)
+    if workerinput:
+        directory = os.path.join(PROFILE_DIR, workerinput['workerid'])
+        # Records stay in the worker; the controller renders the summary from these totals
+        session.config.workeroutput['webdriver_profile'] = {
+            key: {name: list(values) for name, values in profiler.summary(key).items()} for key in SUMMARY_KEYS}
+    profiler.write_folded(directory)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    summary = getattr(node, 'workeroutput', {}).get('webdriver_profile')
+    if summary:
+        _worker_summaries.append(summary)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix):
+    # Adds the summary table to reports/results/report.html when pytest-html is in use
+    if instrumentation.get_profiler() is None or not collected_summary('helper'):
+        return
+    rows = "".join(
+        f"<tr><td>{html.escape(name)}</td><td>{count}</td><td>{total_ms:.1f}</td><td>{total_ms / count:.2f}</td></tr>"
+        for name, (count, total_ms, _) in summary_rows('helper'))
+    postfix.append(f"<h2>WebDriver time by helper</h2><table><tr><th>helper</th><th>calls</th>"
+                   f"<th>total ms</th><th>mean ms</th></tr>{rows}</table>")
@@ -0,0 +1,53 @@
+import os
+import shutil
+from utils.reporting import DEFAULT_REPORT_DIR, ResultStream, render_report
+from utils.structured_logging import worker_id
+
+
+def pytest_addoption(parser):
+    parser.addoption("--stream-report", default=DEFAULT_REPORT_DIR,
+                     help="directory of the streamed JSON-lines results and paginated HTML report")
+    parser.addoption("--no-stream-report", action="store_true", default=False,
+                     help="do not stream results or render the paginated report")
+
+
+def pytest_configure(config):
+    if config.getoption("--no-stream-report"):
+        return
+    report_dir = config.getoption("--stream-report")
+    stream_dir = os.path.join(report_dir, "stream")
+    is_worker = getattr(config, "workerinput", None) is not None
+    is_controller = not is_worker and getattr(config.option, "dist", "no") != "no"
+    if not is_worker:
+        # Workers are started after this, so the previous run is gone before anyone streams
+        shutil.rmtree(stream_dir, ignore_errors=True)
+    # Under xdist each worker streams the tests it runs; the controller only renders
+    stream = None if is_controller else ResultStream(stream_dir, worker_id())
+    config.pluginmanager.register(StreamReporter(stream, stream_dir, None if is_worker else report_dir),
+                                  "stream-reporter")
+
+
+class StreamReporter:
+    """Streams each finished test to disk and renders the HTML viewer at the end of the run."""
+
+    def __init__(self, stream, stream_dir, report_dir):
+        self.stream = stream
+        self.stream_dir = stream_dir
+        self.report_dir = report_dir
+        self.index = None
+
+    def pytest_runtest_logreport(self, report):
+        if self.stream is not None:
+            self.stream.add(report)
+
+    def pytest_sessionfinish(self, session):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.report_dir is None:
+            return
+        self.index = render_report(self.stream_dir, self.report_dir)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.index is not None:
+            terminalreporter.write_line(f"paginated report: {self.index}")
@@ -0,0 +1,87 @@
+import re
+import pytest
+from utils.driver_pool import worker_shard
+from utils.scheduling import RunHistory, lpt_partition, order_nodeids
+
+run_history_key = pytest.StashKey[RunHistory]()
+
+# Group names added for xdist --dist loadgroup; xdist appends "@<group>" to node ids.
+GROUP_PREFIX = 'lpt'
+GROUP_SUFFIX = re.compile(rf'@{GROUP_PREFIX}\d+$')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("scheduling")
+    group.addoption("--no-reorder", action="store_true", default=False,
+                    help="keep collection order instead of running recently failed and fast tests first")
+    group.addoption("--shard-count", type=int, default=1,
+                    help="split tests into this many shards balanced by recorded durations")
+    group.addoption("--shard-index", type=int, default=0,
+                    help="run only this shard (0-based) of --shard-count")
+
+
+def pytest_configure(config):
+    history = RunHistory()
+    config.stash[run_history_key] = history
+    # Under xdist the controller receives every worker's reports; workers do not record
+    record = getattr(config, "workerinput", None) is None
+    config.pluginmanager.register(Scheduler(history, record, not config.getoption("--no-reorder")), "scheduler")
+
+
+def base_nodeid(nodeid):
+    return GROUP_SUFFIX.sub('', nodeid)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(session, config, items):
+    history = config.stash[run_history_key]
+    count, index = config.getoption("--shard-count"), config.getoption("--shard-index")
+    if count > 1:
+        if not 0 <= index < count:
+            raise pytest.UsageError(f"--shard-index must be between 0 and {count - 1}")
+        shard = set(lpt_partition(history.estimates([item.nodeid for item in items]), count)[index])
+        deselected = [item for item in items if item.nodeid not in shard]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in shard]
+
+    if getattr(config.option, "dist", "no") == "loadgroup":
+        # Every worker computes the same partition from the same history file
+        _, workers = worker_shard()
+        by_id = {item.nodeid: item for item in items}
+        for group, nodeids in enumerate(lpt_partition(history.estimates(list(by_id)), workers)):
+            for nodeid in nodeids:
+                if by_id[nodeid].get_closest_marker("xdist_group") is None:
+                    by_id[nodeid].add_marker(pytest.mark.xdist_group(f"{GROUP_PREFIX}{group}"))
+
+
+class Scheduler:
+    """Orders collected tests and records their durations and outcomes for the next run."""
+
+    def __init__(self, history: RunHistory, record: bool, reorder: bool):
+        self.history = history
+        self.record = record
+        self.reorder = reorder
+        self.results = {}
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        # Runs after pytest's own fixture-scope grouping; order_nodeids keeps modules together
+        if not self.reorder:
+            return
+        by_id = {base_nodeid(item.nodeid): item for item in items}
+        items[:] = [by_id[nodeid] for nodeid in order_nodeids(list(by_id), self.history)]
+
+    def pytest_runtest_logreport(self, report):
+        if not self.record:
+            return
+        nodeid = base_nodeid(report.nodeid)
+        duration, failed = self.results.get(nodeid, (0.0, False))
+        self.results[nodeid] = (duration + report.duration, failed or report.failed)
+
+    def pytest_sessionfinish(self):
+        if not self.record or not self.results:
+            return
+        for nodeid, (duration, failed) in self.results.items():
+            self.history.record(nodeid, duration, failed)
+        self.history.save()
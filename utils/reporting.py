@@ -0,0 +1,150 @@
+"""Streams test results as JSON lines and renders them into a paginated HTML viewer.
+
+    python -m utils.reporting [stream_dir] [report_dir]
+"""
+import os
+import sys
+import glob
+import json
+import shutil
+import itertools
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_REPORT_DIR = os.environ.get('STREAM_REPORT_DIR', os.path.join(ROOT, 'reports', 'results', 'live'))
+VIEWER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_viewer.html')
+
+PAGE_SIZE = 500
+# Failure text beyond this is cut; the full traceback is in the log
+MAX_LONGREPR = 20000
+# user_properties holding file paths, linked from the viewer instead of embedded
+FILE_PROPERTIES = ('screenshot', 'page_source')
+# Outcomes listed on the viewer's failures page
+PROBLEM_OUTCOMES = ('failed', 'error', 'interrupted')
+
+
+class ResultStream:
+    """Appends one JSON line per finished test to this process's own file.
+
+    Each process (xdist worker) writes a separate file, so no locking is needed and
+    a crashed run still leaves every result written so far.
+    """
+
+    def __init__(self, stream_dir: str, worker: str):
+        self.worker = worker
+        os.makedirs(stream_dir, exist_ok=True)
+        self.path = os.path.join(stream_dir, f"results-{worker}.jsonl")
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._pending = {}
+
+    def add(self, report):
+        """Collect one phase report; the test is written once its teardown is reported."""
+        entry = self._pending.setdefault(report.nodeid, {
+            'nodeid': report.nodeid, 'outcome': 'passed', 'duration': 0.0, 'worker': self.worker,
+            'start': getattr(report, 'start', None), 'longrepr': '', 'properties': {}})
+        entry['duration'] += report.duration
+        if report.failed:
+            entry['outcome'] = 'failed' if report.when == 'call' else 'error'
+        elif report.skipped and entry['outcome'] == 'passed':
+            entry['outcome'] = 'skipped'
+        if report.longrepr and not entry['longrepr']:
+            entry['longrepr'] = str(report.longrepr)[:MAX_LONGREPR]
+        for name, value in report.user_properties:
+            entry['properties'][name] = value
+        if report.when == 'teardown':
+            self.write(self._pending.pop(report.nodeid))
+
+    def write(self, entry):
+        self._file.write(json.dumps(entry, default=str) + '\n')
+        self._file.flush()
+
+    def close(self):
+        for entry in self._pending.values():
+            entry['outcome'] = 'interrupted'  # Never reached teardown, so its outcome is unknown
+            self.write(entry)
+        self._pending.clear()
+        self._file.close()
+
+
+def read_stream(stream_dir: str):
+    """Yield result entries from every stream file, one line at a time."""
+    for path in sorted(glob.glob(os.path.join(stream_dir, 'results-*.jsonl'))):
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        pass  # A partial last line from a killed worker
+
+
+class _PageWriter:
+    """Writes entries into page-<n>.js files as JSONP, so the viewer works from file://."""
+
+    def __init__(self, report_dir, prefix, page_size):
+        self.report_dir = report_dir
+        self.prefix = prefix
+        self.page_size = page_size
+        self.buffer = []
+        self.pages = 0
+        self.count = 0
+
+    def add(self, entry):
+        self.buffer.append(entry)
+        self.count += 1
+        if len(self.buffer) >= self.page_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer and self.pages:
+            return
+        path = os.path.join(self.report_dir, f"{self.prefix}-{self.pages}.js")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f"reportPage({json.dumps(self.prefix)}, {self.pages}, {json.dumps(self.buffer)});\n")
+        self.pages += 1
+        self.buffer = []
+
+
+def render_report(stream_dir: str, report_dir: str = DEFAULT_REPORT_DIR, page_size: int = PAGE_SIZE):
+    """Render the stream into report_dir/index.html; only one page of results is held in memory."""
+    os.makedirs(report_dir, exist_ok=True)
+    for path in itertools.chain(glob.glob(os.path.join(report_dir, 'all-*.js')),
+                                glob.glob(os.path.join(report_dir, 'problems-*.js'))):
+        os.remove(path)
+    writers = {'all': _PageWriter(report_dir, 'all', page_size),
+               'problems': _PageWriter(report_dir, 'problems', page_size)}
+    totals = {'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0, 'interrupted': 0}
+    duration = 0.0
+    for entry in read_stream(stream_dir):
+        for name, value in entry.get('properties', {}).items():
+            if name in FILE_PROPERTIES and isinstance(value, str) and os.path.isabs(value):
+                entry['properties'][name] = os.path.relpath(value, report_dir).replace(os.sep, '/')
+        totals[entry['outcome']] = totals.get(entry['outcome'], 0) + 1
+        duration += entry['duration']
+        writers['all'].add(entry)
+        if entry['outcome'] in PROBLEM_OUTCOMES:
+            writers['problems'].add(entry)
+    for writer in writers.values():
+        writer.flush()
+    summary = {'totals': totals, 'duration': duration,
+               'pages': {name: writer.pages for name, writer in writers.items()},
+               'counts': {name: writer.count for name, writer in writers.items()}}
+    with open(os.path.join(report_dir, 'summary.js'), 'w', encoding='utf-8') as file:
+        file.write(f"reportSummary({json.dumps(summary)});\n")
+    index = os.path.join(report_dir, 'index.html')
+    shutil.copyfile(VIEWER_FILE, index)
+    return index
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) > 2:
+        print(__doc__.strip())
+        return 2
+    stream_dir = args[0] if args else os.path.join(DEFAULT_REPORT_DIR, 'stream')
+    report_dir = args[1] if len(args) > 1 else DEFAULT_REPORT_DIR
+    print(render_report(stream_dir, report_dir))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
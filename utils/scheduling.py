@@ -0,0 +1,114 @@
+import os
+import json
+import heapq
+import tempfile
+import statistics
+
+DEFAULT_HISTORY_FILE = os.environ.get(
+    'TEST_HISTORY_FILE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'test_history.json'))
+
+# A failure within this many runs counts as recent.
+RECENT_RUNS = 3
+# Weight of the latest run in the moving average of a test's duration.
+SMOOTHING = 0.3
+# Estimate for tests that have never run and have no known neighbours.
+DEFAULT_DURATION = 1.0
+
+
+class RunHistory:
+    """Per-test duration and failure history, keyed by node id (so each CSV row has its own entry)."""
+
+    def __init__(self, history_file: str = DEFAULT_HISTORY_FILE):
+        self.history_file = history_file
+        self.run = 0
+        self.tests = {}
+        self._load()
+
+    def record(self, nodeid: str, duration: float, failed: bool):
+        """Record the outcome of one test in the current run."""
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            entry = self.tests[nodeid] = {'duration': duration, 'runs': 0, 'failures': 0, 'last_failed_run': None}
+        else:
+            entry['duration'] += SMOOTHING * (duration - entry['duration'])
+        entry['runs'] += 1
+        if failed:
+            entry['failures'] += 1
+            entry['last_failed_run'] = self.run + 1
+
+    def recently_failed(self, nodeid: str) -> bool:
+        """True if the test failed in one of the last RECENT_RUNS runs."""
+        entry = self.tests.get(nodeid)
+        return bool(entry and entry['last_failed_run'] and self.run - entry['last_failed_run'] < RECENT_RUNS)
+
+    def estimates(self, nodeids) -> dict:
+        """Expected duration of each test; unknown tests get the median of their module, else of all tests."""
+        by_module = {}
+        for nodeid, entry in self.tests.items():
+            by_module.setdefault(module_of(nodeid), []).append(entry['duration'])
+        durations = [entry['duration'] for entry in self.tests.values()]
+        overall = statistics.median(durations) if durations else DEFAULT_DURATION
+        return {nodeid: self.tests[nodeid]['duration'] if nodeid in self.tests else
+                statistics.median(by_module.get(module_of(nodeid)) or [overall])
+                for nodeid in nodeids}
+
+    def save(self):
+        """Close the current run and persist the history."""
+        if not self.history_file:
+            return
+        self.run += 1
+        payload = json.dumps({'run': self.run, 'tests': self.tests})
+        directory = os.path.dirname(self.history_file)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(payload)
+        os.replace(tmp_path, self.history_file)
+
+    def _load(self):
+        if not self.history_file:
+            return
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            self.run, self.tests = int(data['run']), dict(data['tests'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+
+def module_of(nodeid: str) -> str:
+    return nodeid.split('::', 1)[0]
+
+
+def order_nodeids(nodeids, history: RunHistory):
+    """Recently failed tests first, then fastest first.
+
+    Tests stay grouped by module so module-scoped fixtures (one browser per module)
+    are still set up once; modules are ordered by their own first test.
+    """
+    estimates = history.estimates(nodeids)
+
+    def key(nodeid):
+        return (not history.recently_failed(nodeid), estimates[nodeid])
+
+    modules = {}
+    for nodeid in nodeids:
+        modules.setdefault(module_of(nodeid), []).append(nodeid)
+    groups = [sorted(group, key=key) for group in modules.values()]
+    groups.sort(key=lambda group: key(group[0]))
+    return [nodeid for group in groups for nodeid in group]
+
+
+def lpt_partition(weights: dict, count: int):
+    """Split weights {id: duration} into count bins of near-equal total, longest first.
+
+    Ties are broken by id so every worker computes the same partition.
+    """
+    bins = [[] for _ in range(max(count, 1))]
+    loads = [(0.0, index) for index in range(len(bins))]
+    for key, weight in sorted(weights.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(loads)
+        bins[index].append(key)
+        heapq.heappush(loads, (load + weight, index))
+    return bins
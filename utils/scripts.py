@@ -0,0 +1,326 @@
+"""JavaScript snippets executed in the browser through execute_script."""
+import pkgutil
+
+# The isDisplayed atom that WebElement.is_displayed() runs, shipped with selenium
+IS_DISPLAYED_ATOM = pkgutil.get_data('selenium.webdriver.remote', 'isDisplayed.js').decode('utf-8')
+
+# Text of an element as WebElement.text reports it: the rendered text (CSS text-transform
+# applied), '' for elements that are not displayed, non-breaking spaces as plain spaces and
+# spaces around line breaks removed.
+VISIBLE_TEXT_JS = """
+function visibleText(element, displayed) {
+    if (!displayed) {
+        return '';
+    }
+    return (element.innerText || '').replace(/\\u00a0/g, ' ').split('\\n').map(function (line) {
+        return line.replace(/^[ \\t\\r]+|[ \\t\\r]+$/g, '');
+    }).join('\\n').replace(/^\\n+|\\n+$/g, '');
+}
+"""
+
+# Resolves a Selenium (By, value) pair to the first matching element, or null.
+RESOLVE_LOCATOR_JS = """
+function resolveLocator(by, value) {
+    try {
+        switch (by) {
+            case 'id':
+                return document.getElementById(value);
+            case 'name':
+                return document.getElementsByName(value)[0] || null;
+            case 'xpath':
+                return document.evaluate(value, document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            case 'css selector':
+                return document.querySelector(value);
+            case 'class name':
+                return document.getElementsByClassName(value)[0] || null;
+            case 'tag name':
+                return document.getElementsByTagName(value)[0] || null;
+            case 'link text':
+            case 'partial link text':
+                var links = document.getElementsByTagName('a');
+                for (var i = 0; i < links.length; i++) {
+                    var text = (links[i].innerText || '').trim();
+                    if (by === 'link text' ? text === value : text.indexOf(value) !== -1) {
+                        return links[i];
+                    }
+                }
+                return null;
+        }
+    } catch (e) {
+        return null;
+    }
+    return null;
+}
+
+function resolveChain(chain) {
+    for (var c = 0; c < chain.length; c++) {
+        var found = resolveLocator(chain[c][0], chain[c][1]);
+        if (found) {
+            return found;
+        }
+    }
+    return null;
+}
+"""
+
+# Applies a list of [name, type, [[by, value], ...], data] entries in one round trip and
+# returns one [name, status, message] entry per field.
+FILL_FORM_JS = RESOLVE_LOCATOR_JS + """
+function setNativeValue(element, value) {
+    var proto = Object.getPrototypeOf(element);
+    var descriptor = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(element, value);
+    } else {
+        element.value = value;
+    }
+}
+
+function fire(element, type) {
+    element.dispatchEvent(new Event(type, {bubbles: true}));
+}
+
+var textTypes = ['text', 'password', 'email', 'tel', 'url', 'date', 'range'];
+var results = [];
+var fields = arguments[0];
+for (var i = 0; i < fields.length; i++) {
+    var name = fields[i][0], type = fields[i][1], value = fields[i][3];
+    var element = resolveChain(fields[i][2]);
+    if (!element) {
+        results.push([name, 'missing', 'element not found']);
+        continue;
+    }
+    try {
+        if (textTypes.indexOf(type) !== -1) {
+            element.focus();
+            setNativeValue(element, value);
+            fire(element, 'input');
+            fire(element, 'change');
+            results.push([name, 'filled', '']);
+        } else if (type === 'select') {
+            var option = null;
+            for (var j = 0; j < element.options.length; j++) {
+                if (element.options[j].text.trim() === value) {
+                    option = element.options[j];
+                    break;
+                }
+            }
+            if (!option) {
+                results.push([name, 'error', 'no option with text: ' + value]);
+                continue;
+            }
+            option.selected = true;
+            fire(element, 'input');
+            fire(element, 'change');
+            results.push([name, 'filled', '']);
+        } else if (type === 'radio' || type === 'checkbox') {
+            var wanted = value === 'checked';
+            if (value !== 'checked' && value !== 'unchecked') {
+                results.push([name, 'skipped', 'unsupported value: ' + value]);
+            } else if (type === 'radio' && !wanted) {
+                results.push([name, 'unchanged', '']);
+            } else if (element.checked !== wanted) {
+                element.click();
+                results.push([name, 'filled', '']);
+            } else {
+                results.push([name, 'unchanged', '']);
+            }
+        } else {
+            results.push([name, 'skipped', 'unsupported field type: ' + type]);
+        }
+    } catch (e) {
+        results.push([name, 'error', String(e)]);
+    }
+}
+return results;
+"""
+
+# Installs page-readiness instrumentation once per document: counts pending XHR/fetch
+# requests and records the time of the last network or DOM change.
+READINESS_PROBE_JS = """
+(function () {
+    if (window.__seleniumReadiness) {
+        return;
+    }
+    var state = window.__seleniumReadiness = {pending: 0, lastChange: performance.now()};
+    var touch = function () { state.lastChange = performance.now(); };
+    var done = function () { state.pending = Math.max(state.pending - 1, 0); touch(); };
+
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        touch();
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            touch();
+            var request = originalFetch.apply(this, arguments);
+            request.then(done, done);
+            return request;
+        };
+    }
+
+    var observe = function () {
+        new MutationObserver(touch).observe(document.documentElement,
+            {childList: true, subtree: true, attributes: true, characterData: true});
+    };
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe);
+    }
+})();
+"""
+
+# Returns [readyState, pending requests, ms since last change, running finite animations].
+READINESS_STATE_JS = READINESS_PROBE_JS + """
+var state = window.__seleniumReadiness;
+var animations = 0;
+if (document.getAnimations) {
+    animations = document.getAnimations().filter(function (a) {
+        var timing = a.effect && a.effect.getComputedTiming ? a.effect.getComputedTiming() : {};
+        return a.playState === 'running' && timing.iterations !== Infinity;
+    }).length;
+}
+return [document.readyState, state.pending, performance.now() - state.lastChange, animations];
+"""
+
+# Reads the state of many elements in one round trip. arguments[0] is a list of locator
+# chains, arguments[1] selects all matches of the first chain instead of the first match
+# of each, arguments[2] lists extra attributes to read. Missing elements yield null.
+# `displayed` and `text` follow WebElement.is_displayed() and WebElement.text.
+SNAPSHOT_JS = RESOLVE_LOCATOR_JS + VISIBLE_TEXT_JS + "var isShown = " + IS_DISPLAYED_ATOM + ";\n" + """
+function resolveAll(by, value) {
+    try {
+        switch (by) {
+            case 'id':
+                return Array.prototype.slice.call(document.querySelectorAll('[id="' + value.replace(/"/g, '\\\\"') + '"]'));
+            case 'name':
+                return Array.prototype.slice.call(document.getElementsByName(value));
+            case 'xpath':
+                var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                var nodes = [];
+                for (var n = 0; n < snapshot.snapshotLength; n++) {
+                    nodes.push(snapshot.snapshotItem(n));
+                }
+                return nodes;
+            case 'css selector':
+                return Array.prototype.slice.call(document.querySelectorAll(value));
+            case 'class name':
+                return Array.prototype.slice.call(document.getElementsByClassName(value));
+            case 'tag name':
+                return Array.prototype.slice.call(document.getElementsByTagName(value));
+            case 'link text':
+            case 'partial link text':
+                return Array.prototype.filter.call(document.getElementsByTagName('a'), function (a) {
+                    var text = (a.innerText || '').trim();
+                    return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+                });
+        }
+    } catch (e) {
+        return [];
+    }
+    return [];
+}
+
+function describe(element, attributes) {
+    var attrs = {};
+    for (var a = 0; a < attributes.length; a++) {
+        attrs[attributes[a]] = element.getAttribute(attributes[a]);
+    }
+    var displayed = isShown(element);
+    return {
+        element: element,
+        text: visibleText(element, displayed),
+        value: element.value === undefined ? null : String(element.value),
+        selected: !!(element.selected || element.checked),
+        displayed: displayed,
+        attributes: attrs
+    };
+}
+
+var chains = arguments[0], all = arguments[1], attributes = arguments[2] || [];
+if (all) {
+    var matches = [];
+    for (var c = 0; c < chains[0].length && !matches.length; c++) {
+        matches = resolveAll(chains[0][c][0], chains[0][c][1]);
+    }
+    return matches.map(function (element) { return describe(element, attributes); });
+}
+return chains.map(function (chain) {
+    var element = resolveChain(chain);
+    return element ? describe(element, attributes) : null;
+});
+"""
+
+# Restores the fields of a form to the state recorded when the page was first seen.
+# arguments: url, [[field name, locator chain], ...], spa route reset flag.
+# Returns [on expected page, fingerprint of the field states].
+RESET_FORM_JS = RESOLVE_LOCATOR_JS + """
+var url = arguments[0], fields = arguments[1], spa = arguments[2];
+var strip = function (href) { return href.split('#')[0]; };
+if (strip(location.href) !== strip(url)) {
+    if (!spa) {
+        return [false, null];
+    }
+    history.pushState(null, '', url);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: null}));
+}
+
+function stateOf(element) {
+    if (!element) {
+        return null;
+    }
+    if (element.tagName === 'SELECT') {
+        return ['selected', element.selectedIndex];
+    }
+    if (element.type === 'checkbox' || element.type === 'radio') {
+        return ['checked', element.checked];
+    }
+    return ['value', element.value];
+}
+
+var elements = fields.map(function (field) { return resolveChain(field[1]); });
+var baseline = window.__seleniumFormBaseline = window.__seleniumFormBaseline || {};
+elements.forEach(function (element, i) {
+    var name = fields[i][0];
+    if (!element) {
+        return;
+    }
+    if (!(name in baseline)) {
+        baseline[name] = stateOf(element);  // First visit of this document: remember the pristine state
+        return;
+    }
+    var state = baseline[name];
+    try {
+        if (state[0] === 'selected') {
+            element.selectedIndex = state[1];
+        } else if (state[0] === 'checked') {
+            element.checked = state[1];
+        } else if (element.value !== state[1]) {
+            element.value = state[1];
+        } else {
+            return;
+        }
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+    } catch (e) {
+        // e.g. file inputs only accept an empty value; the fingerprint check catches it
+    }
+});
+return [true, JSON.stringify(elements.map(stateOf))];
+"""
+
+# Identifies the current document and URL: [token, location.href]. The token is stored on the
+# document, so any newly loaded document gets a new one.
+DOCUMENT_STATE_JS = """
+if (!document.__seleniumPageToken) {
+    document.__seleniumPageToken = Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+return [document.__seleniumPageToken, location.href];
+"""
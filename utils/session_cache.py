@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from selenium.common.exceptions import WebDriverException
+
+DEFAULT_SESSION_DIR = os.environ.get(
+    'SESSION_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'sessions'))
+DEFAULT_TTL = int(os.environ.get('SESSION_CACHE_TTL', '1800'))
+
+CAPTURE_STORAGE_JS = """
+var dump = function (storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return [dump(window.localStorage), dump(window.sessionStorage)];
+"""
+
+RESTORE_STORAGE_JS = """
+var restore = function (storage, items) {
+    Object.keys(items).forEach(function (key) { storage.setItem(key, items[key]); });
+};
+restore(window.localStorage, arguments[0]);
+restore(window.sessionStorage, arguments[1]);
+"""
+
+
+class SessionCache:
+    """Persists logged-in browser state (cookies, localStorage, sessionStorage) per user and base URL.
+
+    Entries hold live session cookies, so the cache directory must stay out of version control.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_SESSION_DIR, ttl: int = DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def capture(self, driver, user: str, base_url: str):
+        """Save the current browser state for user; the driver must be on base_url's origin."""
+        local_storage, session_storage = driver.execute_script(CAPTURE_STORAGE_JS)
+        state = {
+            'user': user,
+            'base_url': base_url,
+            'created': time.time(),
+            'cookies': driver.get_cookies(),
+            'local_storage': local_storage,
+            'session_storage': session_storage,
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self._path(user, base_url))
+
+    def load(self, user: str, base_url: str):
+        """Return the saved state for user, or None when missing or older than the TTL."""
+        try:
+            with open(self._path(user, base_url), 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - state.get('created', 0) > self.ttl:
+            return None
+        return state
+
+    def restore(self, driver, user: str, base_url: str, landing_url: str = None):
+        """Inject the saved state into driver and open landing_url. Returns False if nothing is cached."""
+        state = self.load(user, base_url)
+        if state is None:
+            return False
+        driver.get(base_url)  # Cookies and storage can only be set on the matching origin
+        driver.delete_all_cookies()
+        for cookie in state['cookies']:
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                pass  # Cookie belongs to another domain than base_url
+        driver.execute_script(RESTORE_STORAGE_JS, state['local_storage'], state['session_storage'])
+        driver.get(landing_url or base_url)
+        return True
+
+    def invalidate(self, user: str, base_url: str):
+        """Drop the saved state for user."""
+        try:
+            os.remove(self._path(user, base_url))
+        except FileNotFoundError:
+            pass
+
+    def ensure_logged_in(self, driver, user: str, base_url: str, ui_login, is_logged_in, landing_url: str = None):
+        """Restore a cached login, falling back to ui_login() and caching its result.
+
+        Returns True when the cached state was reused.
+        """
+        if self.restore(driver, user, base_url, landing_url) and is_logged_in():
+            return True
+        self.invalidate(user, base_url)
+        ui_login()
+        assert is_logged_in(), f"Login failed for user '{user}'"
+        self.capture(driver, user, base_url)
+        return False
+
+    def _path(self, user, base_url):
+        digest = hashlib.sha1(f"{user}|{base_url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config.driver_setup import load_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+current_test = contextvars.ContextVar('current_test', default='')
+current_actor = contextvars.ContextVar('current_actor', default='')
+
+_listener = None
+_configured_pid = None
+_lock = threading.Lock()
+
+
+def worker_id():
+    """pytest-xdist worker id of this process, or 'main'."""
+    return os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+
+@contextmanager
+def log_context(test: str = None, actor: str = None):
+    """Tag records logged inside the block with a test id and/or actor name."""
+    tokens = []
+    if test is not None:
+        tokens.append((current_test, current_test.set(test)))
+    if actor is not None:
+        tokens.append((current_actor, current_actor.set(actor)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, with the context fields added by ContextQueueHandler."""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'test': getattr(record, 'test', ''),
+            'worker': getattr(record, 'worker', ''),
+            'actor': getattr(record, 'actor', ''),
+            'thread': record.threadName,
+        }
+        duration_ms = getattr(record, 'duration_ms', None)
+        if duration_ms is not None:
+            entry['duration_ms'] = round(duration_ms, 3)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Captures the caller's context, then hands the record to the listener thread.
+
+    The caller only pays for building the record; formatting and file I/O happen on the
+    listener thread.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.test = current_test.get()
+        record.actor = current_actor.get()
+        record.worker = worker_id()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def get_logging_settings():
+    """Return the `logging` section of config.yaml."""
+    return dict(load_config().get('logging') or {})
+
+
+def logging_configured():
+    """True once configure_logging() has taken effect in this process."""
+    with _lock:
+        return _configured_pid == os.getpid()
+
+
+def configure_logging(level=None, log_file: str = None):
+    """Route all logging of this process through one queue to a rotating JSON-lines file.
+
+    Safe to call any number of times; only the first call in a process has an effect.
+    Each xdist worker writes its own file (selenium-gw0.jsonl, ...) so lines never interleave.
+    """
+    global _listener, _configured_pid
+    with _lock:
+        if _configured_pid == os.getpid():
+            return logging.getLogger()
+        settings = get_logging_settings()
+        level = level or os.environ.get('LOG_LEVEL') or settings.get('level', 'INFO')
+        if log_file is None:
+            directory = os.path.join(ROOT, settings.get('directory', 'logs'))
+            suffix = '' if worker_id() == 'main' else f"-{worker_id()}"
+            log_file = os.path.join(directory, f"selenium{suffix}.jsonl")
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+
+        file_handler = RotatingFileHandler(log_file, maxBytes=int(settings.get('max_bytes', 10 * 1024 * 1024)),
+                                           backupCount=int(settings.get('backup_count', 5)), encoding='utf-8')
+        file_handler.setFormatter(JsonLinesFormatter())
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setLevel(settings.get('console_level', 'WARNING'))
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+
+        root = logging.getLogger()
+        for handler in [handler for handler in root.handlers if isinstance(handler, ContextQueueHandler)]:
+            root.removeHandler(handler)  # Inherited from a forked parent whose listener is not ours
+        root.addHandler(ContextQueueHandler(log_queue))
+        root.setLevel(level)
+        _configured_pid = os.getpid()
+        atexit.register(shutdown_logging)
+        return root
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener, _configured_pid
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        root = logging.getLogger()
+        for handler in [handler for handler in root.handlers if isinstance(handler, ContextQueueHandler)]:
+            root.removeHandler(handler)
+        _listener = None
+        _configured_pid = None
+
+
+def get_logger(name: str):
+    """Return a logger, configuring process-wide logging on first use."""
+    configure_logging()
+    return logging.getLogger(name)
+
+
+@contextmanager
+def timed(logger, message: str, *args, level=logging.DEBUG):
+    """Log message with the block's duration in duration_ms."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if logger.isEnabledFor(level):
+            logger.log(level, message, *args, extra={'duration_ms': (time.perf_counter() - start) * 1000})
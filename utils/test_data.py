@@ -0,0 +1,267 @@
+"""Generates synthetic data files for a form definition, deterministically from a seed.
+
+    python -m utils.test_data form_definitions/profilepage_form.csv form_data/profile_load.csv --rows 1000000
+    python -m utils.test_data form_definitions/profilepage_form.csv form_data/profile_load.csv.gz \\
+        --rows 5000000 --workers 8 --option "Country=United States|Canada"
+
+Every row is generated from (seed, row number) alone, so the output is identical whatever
+the number of workers. With several workers each one writes its own shard
+(profile_load-00000.csv, ...) unless --merge is given.
+"""
+import os
+import sys
+import csv
+import gzip
+import string
+import random
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from utils.form_registry import FormDefinition
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Select options by keyword in the field name; unknown selects are left empty
+SELECT_OPTIONS = {
+    'country': ('United States', 'Canada', 'United Kingdom', 'India'),
+    'language': ('English', 'Spanish', 'French'),
+    'timezone': ('UTC', 'EST', 'PST'),
+}
+
+FIRST_NAMES = ('John', 'Jane', 'Alex', 'Maria', 'Wei', 'Aisha', 'Carlos', 'Olga', 'Kenji', 'Fatima')
+LAST_NAMES = ('Doe', 'Smith', 'Garcia', 'Chen', 'Khan', 'Novak', 'Silva', 'Tanaka', 'Okafor', 'Muller')
+CITIES = ('Springfield', 'Metropolis', 'Riverton', 'Lakeside', 'Fairview', 'Greenville')
+STATES = ('IL', 'NY', 'CA', 'TX', 'WA', 'FL')
+STREETS = ('Elm Street', 'Oak Avenue', 'Maple Road', 'Pine Lane', 'Cedar Court')
+EPOCH = datetime.date(1950, 1, 1)
+DATE_SPAN_DAYS = (datetime.date(2005, 12, 31) - EPOCH).days
+
+
+def _text(name, rng, row):
+    lowered = name.lower()
+    if 'first' in lowered:
+        return rng.choice(FIRST_NAMES)
+    if 'last' in lowered:
+        return rng.choice(LAST_NAMES)
+    if 'user' in lowered:
+        return f"user{row}"
+    if 'street' in lowered or 'address' in lowered:
+        return f"{rng.randint(1, 9999)} {rng.choice(STREETS)}"
+    if 'city' in lowered:
+        return rng.choice(CITIES)
+    if 'state' in lowered or 'province' in lowered:
+        return rng.choice(STATES)
+    if 'postal' in lowered or 'zip' in lowered:
+        return f"{rng.randint(0, 99999):05d}"
+    if 'handle' in lowered or 'twitter' in lowered or 'instagram' in lowered:
+        return f"@user{row}"
+    if 'ctc' in lowered or 'salary' in lowered or 'amount' in lowered:
+        return str(rng.randrange(10000, 200001, 1000))
+    return ''.join(rng.choice(string.ascii_letters) for _ in range(rng.randint(5, 12)))
+
+
+def _password(name, rng, row):
+    characters = [rng.choice(string.ascii_uppercase), rng.choice(string.ascii_lowercase),
+                  rng.choice(string.digits), rng.choice('!@#$%^&*')]
+    characters += [rng.choice(string.ascii_letters + string.digits) for _ in range(8)]
+    rng.shuffle(characters)
+    return ''.join(characters)
+
+
+def _email(name, rng, row):
+    return f"user{row}.{rng.randint(0, 999)}@example.com"
+
+
+def _tel(name, rng, row):
+    return f"{rng.randint(2, 9)}{rng.randint(0, 999999999):09d}"
+
+
+def _url(name, rng, row):
+    return f"https://example.com/{name.split()[0].lower()}/user{row}"
+
+
+def _date(name, rng, row):
+    return (EPOCH + datetime.timedelta(days=rng.randint(0, DATE_SPAN_DAYS))).isoformat()
+
+
+def _range(name, rng, row):
+    return str(rng.randint(0, 100))
+
+
+def _checkbox(name, rng, row):
+    return 'checked' if rng.random() < 0.5 else 'unchecked'
+
+
+# field_type -> fn(field name, Random, row number) -> value
+VALUE_GENERATORS = {
+    'text': _text,
+    'password': _password,
+    'email': _email,
+    'tel': _tel,
+    'url': _url,
+    'date': _date,
+    'range': _range,
+    'checkbox': _checkbox,
+    'file': lambda name, rng, row: '',
+}
+
+
+def select_options(name, options=None):
+    """Options used for a select field: explicit ones first, then SELECT_OPTIONS by keyword."""
+    if options and name in options:
+        return tuple(options[name])
+    lowered = name.lower()
+    return next((values for keyword, values in SELECT_OPTIONS.items() if keyword in lowered), ())
+
+
+class RowGenerator:
+    """Builds data rows for a form definition.
+
+    Consecutive radio fields form one group with exactly one 'checked' value per row.
+    """
+
+    def __init__(self, definition: FormDefinition, seed: int = 0, options: dict = None):
+        self.seed = seed
+        self.header = [field.name for field in definition]
+        # Plan of (column indexes, fn(rng, row) -> values) built once, so rows are cheap
+        self._plan = []
+        index, fields = 0, list(definition)
+        while index < len(fields):
+            field = fields[index]
+            if field.field_type == 'radio':
+                end = index
+                while end < len(fields) and fields[end].field_type == 'radio':
+                    end += 1
+                self._plan.append((range(index, end), self._radio_group(end - index)))
+                index = end
+                continue
+            self._plan.append((range(index, index + 1), self._single(field, options)))
+            index += 1
+
+    @staticmethod
+    def _radio_group(size):
+        def generate(rng, row):
+            chosen = rng.randrange(size)
+            return ['checked' if position == chosen else 'unchecked' for position in range(size)]
+        return generate
+
+    @staticmethod
+    def _single(field, options):
+        if field.field_type == 'select':
+            values = select_options(field.name, options)
+            return lambda rng, row: [rng.choice(values) if values else '']
+        generator = VALUE_GENERATORS.get(field.field_type, _text)
+        return lambda rng, row: [generator(field.name, rng, row)]
+
+    def row(self, number: int):
+        """Return the values of row `number`; the same seed and number always give the same row."""
+        rng = random.Random(self.seed * 1000003 + number)
+        values = [''] * len(self.header)
+        for columns, generate in self._plan:
+            for column, value in zip(columns, generate(rng, number)):
+                values[column] = value
+        return values
+
+    def rows(self, start: int, stop: int):
+        """Yield rows start..stop-1."""
+        for number in range(start, stop):
+            yield self.row(number)
+
+
+def _open_output(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def write_rows(definition_file, output, start, stop, seed=0, options=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Write the header and rows start..stop-1 to output, batch_size rows at a time."""
+    generator = RowGenerator(FormDefinition.parse(definition_file), seed, options)
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    with _open_output(output) as file:
+        writer = csv.writer(file)
+        writer.writerow(generator.header)
+        for batch_start in range(start, stop, batch_size):
+            writer.writerows(generator.rows(batch_start, min(batch_start + batch_size, stop)))
+    return output
+
+
+def shard_path(output, index):
+    """profile.csv -> profile-00003.csv (profile.csv.gz -> profile-00003.csv.gz)."""
+    base, extension = output, ''
+    for suffix in ('.gz', '.csv'):
+        if base.endswith(suffix):
+            base, extension = base[:-len(suffix)], suffix + extension
+    return f"{base}-{index:05d}{extension}"
+
+
+def generate(definition_file, output, rows, seed=0, workers=1, options=None,
+             batch_size=DEFAULT_BATCH_SIZE, merge=False):
+    """Generate `rows` rows into output, or into one shard per worker. Returns the written paths."""
+    if workers <= 1:
+        return [write_rows(definition_file, output, 0, rows, seed, options, batch_size)]
+    bounds = [rows * index // workers for index in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(write_rows, definition_file, shard_path(output, index), bounds[index],
+                                   bounds[index + 1], seed, options, batch_size)
+                   for index in range(workers)]
+        shards = [future.result() for future in futures]
+    if not merge:
+        return shards
+    _merge(shards, output)
+    return [output]
+
+
+def _merge(shards, output):
+    """Concatenate shards into output, keeping only the first header."""
+    opener = gzip.open if output.endswith('.gz') else open
+    with opener(output, 'wb') as target:
+        for index, shard in enumerate(shards):
+            with opener(shard, 'rb') as source:
+                header = source.readline()
+                if index == 0:
+                    target.write(header)
+                while True:
+                    chunk = source.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+            os.remove(shard)
+
+
+def parse_options(values):
+    """Parse --option "Field Name=A|B|C" arguments into {field name: (A, B, C)}."""
+    options = {}
+    for value in values or ():
+        name, separator, choices = value.partition('=')
+        if not separator:
+            raise argparse.ArgumentTypeError(f"expected 'Field Name=A|B', got '{value}'")
+        options[name.strip()] = tuple(choice.strip() for choice in choices.split('|') if choice.strip())
+    return options
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('definition', help='form definition CSV')
+    parser.add_argument('output', help='data CSV to write (.gz to compress)')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help='processes; each writes its own shard')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--merge', action='store_true', help='concatenate worker shards into output')
+    parser.add_argument('--option', action='append', default=[], metavar='"FIELD=A|B"',
+                        help='values for a select field')
+    args = parser.parse_args(argv)
+    try:
+        options = parse_options(args.option)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    for path in generate(args.definition, args.output, args.rows, args.seed, args.workers, options,
+                         args.batch_size, args.merge):
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import time
+import weakref
+from selenium.common.exceptions import WebDriverException
+from utils.scripts import READINESS_PROBE_JS, READINESS_STATE_JS
+
+# Drivers that already have the probe registered for every new document.
+_instrumented = weakref.WeakSet()
+
+
+class PageReadiness:
+    """Waits for a page to settle instead of sleeping a fixed time.
+
+    A page is stable when document.readyState is complete, no XHR/fetch request is
+    pending, no finite animation is running and the DOM has been quiet for quiet_ms.
+    """
+
+    def __init__(self, driver, quiet_ms: int = 100, poll_interval: float = 0.05):
+        self.driver = driver
+        self.quiet_ms = quiet_ms
+        self.poll_interval = poll_interval
+
+    def install(self):
+        """Register the probe to run before page scripts on every new document (Chromium only)."""
+        if self.driver in _instrumented:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_PROBE_JS})
+        except (AttributeError, WebDriverException):
+            pass  # Falls back to injecting the probe on the first readiness check of each page
+        _instrumented.add(self.driver)
+
+    def state(self):
+        """Return the current readiness signals as a dict."""
+        ready_state, pending, quiet_for, animations = self.driver.execute_script(READINESS_STATE_JS)
+        return {'ready_state': ready_state, 'pending': pending, 'quiet_ms': quiet_for, 'animations': animations}
+
+    def is_stable(self):
+        """Check whether the page is settled right now."""
+        state = self.state()
+        return (state['ready_state'] == 'complete' and state['pending'] == 0
+                and state['animations'] == 0 and state['quiet_ms'] >= self.quiet_ms)
+
+    def wait_until_stable(self, timeout: float = 10):
+        """Wait until the page is stable, capped at timeout seconds. Returns False on timeout."""
+        self.install()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if self.is_stable():
+                    return True
+            except WebDriverException:
+                pass  # Page is navigating; the probe is reinstalled on the new document
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))